@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+발송 전체 벤치마크 / 부하 테스트
+가짜 시트(MemoryWorksheet)와 로컬 스텁 SMTP 서버로 main()을 처음부터 끝까지 실행하고
+처리량, 메일 1건 발송 지연(p50/p99), 최대 메모리 사용량을 보고합니다.
+Google 인증이나 Gmail 계정 없이 실행됩니다.
+
+사용법:
+    python3 bench_mailer.py                                  # 1천 / 1만 / 10만 행
+    python3 bench_mailer.py --rows 1000 --message-delay 0.01 --failure-rate 0.02 --workers 8
+    python3 bench_mailer.py --rows 10000 --message-delay 0.01 --senders 4    # 발신 계정 4개로 나눠 발송
+"""
+
+import argparse
+import contextlib
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from stub_smtp import StubSMTPServer
+
+
+def peak_memory_mb() -> float:
+    """이 프로세스의 최대 메모리 사용량(MB)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_child(args):
+    """하위 프로세스: 가짜 시트로 main() 한 번 실행 후 결과를 JSON으로 출력"""
+    from fake_sheet import MemoryWorksheet, synthetic_rows
+
+    worksheet = MemoryWorksheet(
+        synthetic_rows(args.rows, sent_ratio=args.sent_ratio, duplicate_every=args.duplicate_every),
+        latency=args.sheet_latency,
+    )
+
+    import main as mailer
+
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        mailer.main(worksheet=worksheet)
+    elapsed = time.perf_counter() - start
+
+    # 메일 1건 지연은 main()이 남긴 실행 리포트에서 읽기
+    summary_path = max(glob.glob(os.path.join(mailer.REPORT_DIR, "run_*.summary.json")))
+    with open(summary_path, encoding="utf-8") as f:
+        summary = json.load(f)
+    latency = summary["message_latency_ms"]
+
+    sent_rows = sum(1 for row in worksheet.rows[1:] if len(row) > 3 and row[3])
+    print(json.dumps({
+        "elapsed": elapsed,
+        "attempts": latency["count"],
+        "sent_rows": sent_rows,
+        "p50": latency["p50"] / 1000,
+        "p99": latency["p99"] / 1000,
+        "peak_mb": peak_memory_mb(),
+        "sheet_calls": dict(worksheet.calls),
+    }))
+
+
+def run_size(args, rows: int) -> dict:
+    """행 수 하나에 대해 스텁 SMTP 서버를 띄우고 하위 프로세스로 main() 실행"""
+    with StubSMTPServer(
+        message_delay=args.message_delay,
+        connect_delay=args.connect_delay,
+        failure_rate=args.failure_rate,
+        disconnect_rate=args.disconnect_rate,
+        seed=1,
+    ) as server, tempfile.TemporaryDirectory() as state_dir:
+        env = dict(
+            os.environ,
+            GOOGLE_SHEET_URL="memory://bench",
+            SHEET_BACKEND="google",
+            GMAIL_ID="bench@example.com",
+            GMAIL_APP_PASSWORD="password",
+            SMTP_HOST="127.0.0.1",
+            SMTP_PORT=str(server.port),
+            SMTP_USE_SSL="0",
+            MAILER_STATE_DIR=state_dir,
+            SEND_WORKERS=str(args.workers),
+            SEND_RATE_PER_SECOND="0",
+            SEND_DAILY_LIMIT="0",
+            SENDER_ACCOUNTS=",".join(f"bench{i}@example.com:password" for i in range(args.senders)) if args.senders > 1 else "",
+        )
+        command = [
+            sys.executable, os.path.abspath(__file__), "--child",
+            "--rows", str(rows),
+            "--sent-ratio", str(args.sent_ratio),
+            "--duplicate-every", str(args.duplicate_every),
+            "--sheet-latency", str(args.sheet_latency),
+        ]
+        output = subprocess.run(
+            command, env=env, check=True, capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        result["smtp"] = dict(server.stats)
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="발송 전체 벤치마크 (가짜 시트 + 스텁 SMTP)")
+    parser.add_argument("--rows", default="1000,10000,100000", help="행 수 (쉼표로 여러 개)")
+    parser.add_argument("--workers", type=int, default=4, help="발송 워커 수 (계정별)")
+    parser.add_argument("--senders", type=int, default=1, help="발신 계정 수 (2 이상이면 계정별 프로세스로 나눠 발송)")
+    parser.add_argument("--message-delay", type=float, default=0.0, help="SMTP 메일 1건 지연(초)")
+    parser.add_argument("--connect-delay", type=float, default=0.0, help="SMTP 연결 지연(초)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="451 일시 오류 비율 (0~1)")
+    parser.add_argument("--disconnect-rate", type=float, default=0.0, help="421 연결 끊김 비율 (0~1)")
+    parser.add_argument("--sheet-latency", type=float, default=0.0, help="시트 API 호출 1회 지연(초)")
+    parser.add_argument("--sent-ratio", type=float, default=0.0, help="이미 발송된 행 비율 (0~1)")
+    parser.add_argument("--duplicate-every", type=int, default=0, help="N행마다 중복 이메일")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        args.rows = int(args.rows)
+        run_child(args)
+        return
+
+    print(f"{'행 수':>8} | {'시간(s)':>8} | {'건/초':>8} | {'p50(ms)':>8} | {'p99(ms)':>8} | {'메모리(MB)':>10} | 시트 API 호출")
+    for rows in (int(value) for value in args.rows.split(",")):
+        result = run_size(args, rows)
+        throughput = result["attempts"] / result["elapsed"] if result["elapsed"] else 0
+        calls = ", ".join(f"{name} {count}" for name, count in sorted(result["sheet_calls"].items()))
+        print(
+            f"{rows:>8} | {result['elapsed']:>8.2f} | {throughput:>8.1f} | "
+            f"{result['p50'] * 1000:>8.2f} | {result['p99'] * 1000:>8.2f} | {result['peak_mb']:>10.1f} | {calls}"
+        )
+        print(
+            f"{'':>8}   발송시간 기록된 행 {result['sent_rows']}행, SMTP 수신 {result['smtp']['messages']}건 "
+            f"(연결 {result['smtp']['connections']}, 일시 오류 {result['smtp']['failures']}, "
+            f"연결 끊김 {result['smtp']['disconnects']})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+SMTP 연결 풀 벤치마크
+로컬 스텁 SMTP 서버를 상대로 "메일마다 새 연결 + 로그인" 방식과
+연결 풀 방식의 초당 발송 건수를 비교합니다.
+
+사용법:
+    python3 bench_smtp_pool.py --messages 200 --connect-delay 0.05 --login-delay 0.05
+"""
+
+import argparse
+import smtplib
+import time
+
+from smtp_pool import SMTPConnectionPool
+from stub_smtp import StubSMTPServer
+
+FROM_ADDR = "bench@example.com"
+TO_ADDR = "to@example.com"
+MESSAGE = "Subject: bench\r\n\r\nhello\r\n"
+
+
+def bench_per_message(port: int, count: int) -> float:
+    """기존 방식: 메일마다 연결 + 로그인 + 종료"""
+    start = time.perf_counter()
+    for _ in range(count):
+        with smtplib.SMTP("127.0.0.1", port) as server:
+            server.login("user", "password")
+            server.sendmail(FROM_ADDR, TO_ADDR, MESSAGE)
+    return time.perf_counter() - start
+
+
+def bench_pool(port: int, count: int, max_messages: int) -> float:
+    """연결 풀 방식: 로그인된 연결을 재사용"""
+    start = time.perf_counter()
+    with SMTPConnectionPool(
+        "127.0.0.1", port, "user", "password",
+        max_messages_per_connection=max_messages, use_ssl=False,
+    ) as pool:
+        for _ in range(count):
+            pool.send(FROM_ADDR, TO_ADDR, MESSAGE)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SMTP 연결 풀 벤치마크")
+    parser.add_argument("--messages", type=int, default=200, help="발송할 메일 수")
+    parser.add_argument("--connect-delay", type=float, default=0.05, help="연결(TLS 핸드셰이크) 지연(초)")
+    parser.add_argument("--login-delay", type=float, default=0.05, help="로그인 지연(초)")
+    parser.add_argument("--max-messages", type=int, default=100, help="연결당 최대 발송 건수")
+    args = parser.parse_args()
+
+    with StubSMTPServer(connect_delay=args.connect_delay, login_delay=args.login_delay) as server:
+        before = bench_per_message(server.port, args.messages)
+        after = bench_pool(server.port, args.messages, args.max_messages)
+
+    print(f"메일 {args.messages}건 (연결 지연 {args.connect_delay}s, 로그인 지연 {args.login_delay}s)")
+    print(f"  - 메일마다 연결: {args.messages / before:8.1f} 건/초 ({before:.2f}s)")
+    print(f"  - 연결 풀     : {args.messages / after:8.1f} 건/초 ({after:.2f}s)")
+    print(f"  - 향상        : {before / after:.1f}배")
+
+
+if __name__ == "__main__":
+    main()
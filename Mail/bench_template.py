@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+이메일 템플릿 렌더링 벤치마크
+기존 방식(f-string으로 전체 HTML 생성 + MIMEMultipart.as_string())과
+사전 컴파일 템플릿(MessageBuilder.build)의 초당 렌더링 건수와 메일 1건당 할당 바이트를 비교합니다.
+
+사용법:
+    python3 bench_template.py --messages 5000
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.utils import formataddr
+
+from template_engine import MessageBuilder
+
+SENDER_NAME = "홍길동"
+GMAIL_ID = "sender@gmail.com"
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+
+def legacy_template(company_name: str, representative_name: str) -> str:
+    """기존 main.get_email_template (f-string으로 매번 전체 문서 생성)"""
+    return f"""
+<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <style>
+        body {{
+            font-family: 'Apple SD Gothic Neo', 'Malgun Gothic', sans-serif;
+            line-height: 1.8;
+            color: #333;
+            max-width: 600px;
+            margin: 0 auto;
+            padding: 20px;
+        }}
+        .greeting {{
+            margin-bottom: 20px;
+        }}
+        .content {{
+            margin-bottom: 30px;
+        }}
+        .signature {{
+            border-top: 1px solid #e0e0e0;
+            padding-top: 20px;
+            margin-top: 30px;
+        }}
+        .signature-card {{
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            border-radius: 10px;
+            padding: 20px;
+            color: white;
+        }}
+        .signature-name {{
+            font-size: 18px;
+            font-weight: bold;
+            margin-bottom: 5px;
+        }}
+        .signature-title {{
+            font-size: 14px;
+            opacity: 0.9;
+            margin-bottom: 15px;
+        }}
+        .signature-info {{
+            font-size: 13px;
+            opacity: 0.85;
+        }}
+        .signature-info p {{
+            margin: 3px 0;
+        }}
+    </style>
+</head>
+<body>
+    <div class="greeting">
+        <p>안녕하세요, <strong>{company_name}</strong> {representative_name} 대표님.</p>
+    </div>
+
+    <div class="content">
+        <p>바쁘신 와중에 메일 드려 죄송합니다.</p>
+
+        <p>저희는 기업의 비즈니스 성장을 돕는 솔루션을 제공하고 있습니다.</p>
+
+        <p>{company_name}의 사업 현황을 살펴보고, 귀사에 도움이 될 수 있는 부분이 있을 것 같아 연락드렸습니다.</p>
+
+        <p>짧게 10분 정도 통화가 가능하시다면, 구체적인 협업 방안을 말씀드리고 싶습니다.</p>
+
+        <p>편하신 시간에 회신 부탁드립니다.</p>
+
+        <p>감사합니다.</p>
+    </div>
+
+    <div class="signature">
+        <div class="signature-card">
+            <div class="signature-name">{SENDER_NAME}</div>
+            <div class="signature-title">Business Development</div>
+            <div class="signature-info">
+                <p>Email: {GMAIL_ID}</p>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+
+def legacy_build(to_email: str, company_name: str, representative_name: str) -> str:
+    """기존 main.send_email의 메일 생성 부분"""
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = f"[{company_name}] 비즈니스 협업 제안"
+    msg["From"] = formataddr((SENDER_NAME, GMAIL_ID))
+    msg["To"] = to_email
+
+    html_content = legacy_template(company_name, representative_name)
+    msg.attach(MIMEText(html_content, "html", "utf-8"))
+    return msg.as_string()
+
+
+def recipients(count: int):
+    return [(f"user{i}@example.com", f"테스트회사{i}", f"대표{i}") for i in range(count)]
+
+
+def measure(build, rows) -> tuple:
+    """(초당 렌더링 건수, 메일 1건당 할당 바이트) 반환"""
+    start = time.perf_counter()
+    for to_email, company_name, representative_name in rows:
+        build(to_email, company_name, representative_name)
+    elapsed = time.perf_counter() - start
+
+    # 할당량은 tracemalloc 오버헤드를 피하려고 일부 건수만 따로 측정
+    sample = rows[:200]
+    tracemalloc.start()
+    total = 0
+    for to_email, company_name, representative_name in sample:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        build(to_email, company_name, representative_name)
+        total += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    return len(rows) / elapsed, total / len(sample)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이메일 템플릿 렌더링 벤치마크")
+    parser.add_argument("--messages", type=int, default=5000, help="렌더링할 메일 수")
+    args = parser.parse_args()
+
+    builder = MessageBuilder.from_files(
+        os.path.join(TEMPLATE_DIR, "cold_email.html"),
+        os.path.join(TEMPLATE_DIR, "cold_email_subject.txt"),
+        SENDER_NAME,
+        GMAIL_ID,
+    )
+
+    def compiled_build(to_email, company_name, representative_name):
+        return builder.build(to_email, company_name=company_name, representative_name=representative_name)
+
+    rows = recipients(args.messages)
+    legacy_rate, legacy_bytes = measure(legacy_build, rows)
+    compiled_rate, compiled_bytes = measure(compiled_build, rows)
+
+    print(f"메일 {args.messages}건 렌더링")
+    print(f"  - 기존 방식     : {legacy_rate:9.0f} 건/초, 건당 최대 {legacy_bytes / 1024:6.1f} KB 할당")
+    print(f"  - 사전 컴파일   : {compiled_rate:9.0f} 건/초, 건당 최대 {compiled_bytes / 1024:6.1f} KB 할당")
+    print(f"  - 향상          : {compiled_rate / legacy_rate:.1f}배 빠름, 할당 {legacy_bytes / compiled_bytes:.1f}배 감소")
+
+
+if __name__ == "__main__":
+    main()
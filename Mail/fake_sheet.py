@@ -0,0 +1,173 @@
+"""
+가짜 워크시트 (메모리 / CSV)
+Google 인증 없이 발송 로직을 시험하거나 벤치마크할 때 gspread 워크시트 대신 사용합니다.
+main.py가 쓰는 row_values / get_all_values / get / update / update_cell / batch_update / format을 지원합니다.
+"""
+
+import csv
+import os
+import re
+import threading
+import time
+from collections import Counter
+
+_CELL = re.compile(r"^([A-Z]+)(\d+)$")
+
+
+def _column_number(letters: str) -> int:
+    number = 0
+    for letter in letters:
+        number = number * 26 + ord(letter) - ord("A") + 1
+    return number
+
+
+def parse_range(a1: str) -> tuple:
+    """"A2:D10" 또는 "D5" 형식의 범위를 (시작 행, 시작 열, 끝 행, 끝 열)로 변환 (1부터)"""
+    start, _, end = a1.partition(":")
+    start_col, start_row = _CELL.match(start).groups()
+    end_col, end_row = _CELL.match(end or start).groups()
+    return int(start_row), _column_number(start_col), int(end_row), _column_number(end_col)
+
+
+def synthetic_rows(count: int, sent_ratio: float = 0.0, duplicate_every: int = 0) -> list:
+    """헤더 + count개의 가상 고객 행 생성
+
+    - sent_ratio: 앞쪽에서 이미 발송된(발송시간이 있는) 행의 비율
+    - duplicate_every: N행마다 바로 앞 행과 같은 이메일 사용 (0이면 중복 없음)
+    """
+    rows = [["이메일", "회사명", "대표자명", "발송시간"]]
+    sent_rows = int(count * sent_ratio)
+    for i in range(count):
+        email_number = i - 1 if duplicate_every and i and i % duplicate_every == 0 else i
+        sent_time = "2026-01-01 09:00:00" if i < sent_rows else ""
+        rows.append([f"user{email_number}@example.com", f"테스트회사{i}", f"대표{i}", sent_time])
+    return rows
+
+
+class MemoryWorksheet:
+    """메모리에 행을 보관하는 워크시트 (API 호출마다 latency초 지연, 호출 횟수 집계)"""
+
+    def __init__(self, rows: list = None, latency: float = 0.0):
+        self.rows = [list(row) for row in rows or []]
+        self.latency = latency
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    def _call(self, name: str):
+        self.calls[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        self._refresh()
+
+    def _refresh(self):
+        """읽기/쓰기 전처리 (CSV 워크시트에서 파일이 바뀌었으면 다시 읽기)"""
+
+    def _ensure(self, row: int, col: int):
+        while len(self.rows) < row:
+            self.rows.append([])
+        cells = self.rows[row - 1]
+        while len(cells) < col:
+            cells.append("")
+
+    def _write(self, a1: str, values: list):
+        start_row, start_col, _, _ = parse_range(a1)
+        for r, row_values in enumerate(values):
+            for c, value in enumerate(row_values):
+                self._ensure(start_row + r, start_col + c)
+                self.rows[start_row + r - 1][start_col + c - 1] = str(value)
+
+    def _saved(self):
+        """쓰기 후처리 (CSV 워크시트에서 파일 저장)"""
+
+    @staticmethod
+    def _trim(cells: list) -> list:
+        while cells and cells[-1] == "":
+            cells = cells[:-1]
+        return cells
+
+    def row_values(self, row: int) -> list:
+        with self._lock:
+            self._call("row_values")
+            return self._trim(list(self.rows[row - 1])) if row <= len(self.rows) else []
+
+    def get_all_values(self) -> list:
+        with self._lock:
+            self._call("get_all_values")
+            width = max((len(row) for row in self.rows), default=0)
+            return [row + [""] * (width - len(row)) for row in self.rows]
+
+    def get(self, a1: str) -> list:
+        """범위의 값 반환 (gspread처럼 끝부분의 빈 행/빈 칸은 제외)"""
+        with self._lock:
+            self._call("get")
+            start_row, start_col, end_row, end_col = parse_range(a1)
+            values = [
+                self._trim(list(row[start_col - 1:end_col]))
+                for row in self.rows[start_row - 1:end_row]
+            ]
+            while values and not values[-1]:
+                values.pop()
+            return values
+
+    def update(self, a1: str, values: list, **kwargs):
+        with self._lock:
+            self._call("update")
+            self._write(a1, values)
+            self._saved()
+
+    def update_cell(self, row: int, col: int, value):
+        with self._lock:
+            self._call("update_cell")
+            self._ensure(row, col)
+            self.rows[row - 1][col - 1] = str(value)
+            self._saved()
+
+    def batch_update(self, data: list, **kwargs):
+        with self._lock:
+            self._call("batch_update")
+            for item in data:
+                self._write(item["range"], item["values"])
+            self._saved()
+
+    def format(self, a1: str, fmt: dict):
+        with self._lock:
+            self._call("format")
+
+
+class CSVWorksheet(MemoryWorksheet):
+    """CSV 파일을 시트처럼 사용하는 워크시트 (쓰기마다 파일에 저장)
+
+    실행 중 다른 프로그램이 파일을 고쳐도(행 추가 등) 다음 호출 때 다시 읽으므로,
+    쓰기는 항상 최신 파일 내용 위에 반영됩니다.
+    """
+
+    def __init__(self, path: str, latency: float = 0.0):
+        self.path = path
+        self._stat = None
+        super().__init__([], latency)
+        self._refresh()
+
+    def _file_stat(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _refresh(self):
+        stat = self._file_stat()
+        if stat == self._stat:
+            return
+        rows = []
+        if stat is not None:
+            with open(self.path, encoding="utf-8-sig", newline="") as f:
+                rows = list(csv.reader(f))
+        self.rows = rows
+        self._stat = stat
+
+    def _saved(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            csv.writer(f).writerows(self.rows)
+        os.replace(tmp_path, self.path)
+        self._stat = self._file_stat()
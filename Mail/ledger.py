@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+발송 원장 (SQLite)
+캠페인 + 이메일(정규화) 단위로 발송 의도/완료 상태를 기록해 중복 발송을 막습니다.
+수신 거부/반송 목록(suppression)도 함께 관리합니다.
+
+사용법:
+    python3 ledger.py suppress bounces.csv --reason bounce    # 수신 거부/반송 목록 일괄 등록
+    python3 ledger.py report                                  # 건너뛴 중복/수신 거부 행, 발송 확인이 필요한 이메일 보기
+    python3 ledger.py clear-unconfirmed [이메일 ...]           # 발송 도중 중단된 기록 삭제 (다음 실행 때 다시 발송)
+"""
+
+import argparse
+import csv
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+# main.py와 같은 상태 파일 폴더의 원장 사용 (.env의 MAILER_STATE_DIR)
+load_dotenv()
+DEFAULT_LEDGER_PATH = os.path.join(
+    os.getenv("MAILER_STATE_DIR", os.path.dirname(os.path.abspath(__file__))), "send_ledger.db"
+)
+
+# claim() 결과
+CLAIMED = "claimed"
+DUPLICATE = "duplicate"
+ALREADY_SENT = "already_sent"
+UNCONFIRMED = "unconfirmed"
+SUPPRESSED = "suppressed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sends (
+    campaign TEXT NOT NULL,
+    email TEXT NOT NULL,
+    state TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    row_idx INTEGER,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (campaign, email)
+);
+CREATE TABLE IF NOT EXISTS suppressions (
+    email TEXT PRIMARY KEY,
+    reason TEXT NOT NULL,
+    added_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    pid INTEGER NOT NULL,
+    started_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS skipped_rows (
+    run_id TEXT NOT NULL,
+    campaign TEXT NOT NULL,
+    row_idx INTEGER NOT NULL,
+    email TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    skipped_at TEXT NOT NULL
+);
+"""
+
+
+def normalize_email(email: str) -> str:
+    """비교용 이메일 정규화 (앞뒤 공백 제거, 소문자)"""
+    return email.strip().lower()
+
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _pid_alive(pid: int) -> bool:
+    """같은 컴퓨터에서 pid 프로세스가 실행 중인지 확인"""
+    if os.name == "nt":
+        # Windows의 os.kill은 프로세스를 종료하므로 확인할 수 없음: 실행 중으로 간주
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SendLedger:
+    """캠페인별 발송 원장
+
+    - intent: 발송 직전 기록 (이 상태로 남아 있으면 발송 도중 프로세스가 종료된 것)
+    - sent: 발송 완료
+    조회/기록은 모두 기본 키 인덱스를 사용하므로 행마다 일정한 시간이 걸립니다.
+    """
+
+    def __init__(self, path: str, campaign: str):
+        self.path = path
+        self.campaign = campaign
+        self.run_id = uuid.uuid4().hex
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        # 실행 중인 원장 등록 (다른 프로세스가 이 실행의 발송 의도 기록을 중단된 것으로 보지 않도록)
+        self._conn.execute("INSERT INTO runs VALUES (?, ?, ?)", (self.run_id, os.getpid(), _now()))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _execute(self, sql: str, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def claim(self, email: str, row_idx: int) -> str:
+        """발송 의도 기록 (CLAIMED이면 발송 진행, 그 외에는 건너뛸 이유 반환)"""
+        key = normalize_email(email)
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM suppressions WHERE email = ?", (key,)).fetchone():
+                result = SUPPRESSED
+            else:
+                inserted = self._conn.execute(
+                    "INSERT OR IGNORE INTO sends VALUES (?, ?, 'intent', ?, ?, ?)",
+                    (self.campaign, key, self.run_id, row_idx, _now()),
+                ).rowcount
+                if inserted:
+                    return CLAIMED
+
+                state, run_id = self._conn.execute(
+                    "SELECT state, run_id FROM sends WHERE campaign = ? AND email = ?",
+                    (self.campaign, key),
+                ).fetchone()
+                if run_id == self.run_id:
+                    result = DUPLICATE
+                elif state == "sent":
+                    result = ALREADY_SENT
+                else:
+                    result = UNCONFIRMED
+
+            self._conn.execute(
+                "INSERT INTO skipped_rows VALUES (?, ?, ?, ?, ?, ?)",
+                (self.run_id, self.campaign, row_idx, key, result, _now()),
+            )
+            return result
+
+    def confirm(self, email: str):
+        """발송 완료 기록"""
+        self._execute(
+            "UPDATE sends SET state = 'sent', updated_at = ? WHERE campaign = ? AND email = ?",
+            (_now(), self.campaign, normalize_email(email)),
+        )
+
+    def release(self, email: str):
+        """발송 실패 시 의도 기록 삭제 (다음 실행 때 다시 발송)"""
+        self._execute(
+            "DELETE FROM sends WHERE campaign = ? AND email = ? AND state = 'intent' AND run_id = ?",
+            (self.campaign, normalize_email(email), self.run_id),
+        )
+
+    def hold(self, email: str):
+        """발송 여부를 알 수 없게 된 의도 기록을 남겨 둠 (close()에서 지우지 않고 report/clear-unconfirmed로 확인)"""
+        self._execute(
+            "UPDATE sends SET run_id = ?, updated_at = ? WHERE campaign = ? AND email = ? AND state = 'intent' AND run_id = ?",
+            (f"{self.run_id}-held", _now(), self.campaign, normalize_email(email), self.run_id),
+        )
+
+    def mark_sent(self, email: str, row_idx: int):
+        """시트에 발송시간이 이미 있는 행을 원장에도 반영 (같은 이메일의 다른 행 중복 방지)
+
+        발송 도중 중단되어 의도(intent)로 남은 기록도 시트에 발송시간이 있으면 발송 완료로 바꿉니다.
+        """
+        self._execute(
+            "INSERT INTO sends VALUES (?, ?, 'sent', '', ?, ?) "
+            "ON CONFLICT (campaign, email) DO UPDATE SET state = 'sent', updated_at = excluded.updated_at "
+            "WHERE state != 'sent'",
+            (self.campaign, normalize_email(email), row_idx, _now()),
+        )
+
+    def suppress(self, emails, reason: str) -> int:
+        """수신 거부/반송 이메일 일괄 등록 (새로 등록된 건수 반환)"""
+        now = _now()
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO suppressions VALUES (?, ?, ?)",
+                ((normalize_email(email), reason, now) for email in emails if email.strip()),
+            )
+            self._conn.execute("COMMIT")
+            return self._conn.total_changes - before
+
+    def skipped_rows(self, run_id: str = None) -> list:
+        """건너뛴 행 목록 [(행 번호, 이메일, 사유)] (run_id 생략 시 이번 실행)"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT row_idx, email, reason FROM skipped_rows WHERE run_id = ? ORDER BY row_idx",
+                (run_id or self.run_id,),
+            ).fetchall()
+
+    def last_skipped_run(self) -> str:
+        """건너뛴 행이 기록된 가장 최근 실행의 run_id (없으면 None)"""
+        row = self._execute("SELECT run_id FROM skipped_rows ORDER BY skipped_at DESC, rowid DESC LIMIT 1")
+        return row[0] if row else None
+
+    def _live_runs(self) -> list:
+        """실행 중인 원장의 run_id (종료된 프로세스의 등록은 정리, _lock 안에서 호출)"""
+        live = []
+        for run_id, pid in self._conn.execute("SELECT run_id, pid FROM runs").fetchall():
+            if run_id == self.run_id or _pid_alive(pid):
+                live.append(run_id)
+            else:
+                self._conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+        return live
+
+    def _interrupted_where(self, campaign: str = None) -> tuple:
+        """중단된 실행의 발송 의도 기록 조건 (실행 중인 다른 프로세스의 발송 중인 기록은 제외)"""
+        live = self._live_runs()
+        sql = f"state = 'intent' AND run_id NOT IN ({', '.join('?' * len(live))}) AND (? IS NULL OR campaign = ?)"
+        return sql, (*live, campaign, campaign)
+
+    def unconfirmed(self, campaign: str = None) -> list:
+        """발송 도중 중단되어 발송 여부를 알 수 없는 기록 [(캠페인, 이메일, 행 번호, 시각)] (campaign 생략 시 전체)"""
+        with self._lock:
+            where, params = self._interrupted_where(campaign)
+            return self._conn.execute(
+                f"SELECT campaign, email, row_idx, updated_at FROM sends WHERE {where} ORDER BY campaign, row_idx",
+                params,
+            ).fetchall()
+
+    def clear_unconfirmed(self, emails=None, campaign: str = None) -> int:
+        """발송 도중 중단된 기록 삭제 (다음 실행 때 다시 발송 대상이 됨, 삭제 건수 반환)
+
+        emails를 생략하면 전부 삭제합니다. 메일함에서 실제로 발송되지 않았는지 확인한 뒤 사용하세요.
+        감시 모드 등 실행 중인 프로세스가 지금 발송 중인 기록은 삭제하지 않습니다.
+        """
+        with self._lock:
+            where, params = self._interrupted_where(campaign)
+            if emails is None:
+                return self._conn.execute(f"DELETE FROM sends WHERE {where}", params).rowcount
+            return sum(
+                self._conn.execute(
+                    f"DELETE FROM sends WHERE {where} AND email = ?", (*params, normalize_email(email))
+                ).rowcount
+                for email in emails
+            )
+
+    def close(self):
+        """이번 실행에서 발송하지 못한 의도 기록을 정리하고 연결 종료"""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM sends WHERE state = 'intent' AND run_id = ?", (self.run_id,)
+            )
+            self._conn.execute("DELETE FROM runs WHERE run_id = ?", (self.run_id,))
+            self._conn.close()
+
+
+def read_emails(path: str):
+    """CSV/텍스트 파일의 첫 번째 열에서 이메일 읽기"""
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for row in csv.reader(f):
+            if row and "@" in row[0]:
+                yield row[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="발송 원장 관리")
+    parser.add_argument("--db", default=DEFAULT_LEDGER_PATH, help="원장 파일 경로")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    suppress_parser = commands.add_parser("suppress", help="수신 거부/반송 목록 일괄 등록")
+    suppress_parser.add_argument("path", help="첫 번째 열에 이메일이 있는 CSV/텍스트 파일")
+    suppress_parser.add_argument("--reason", default="unsubscribe", help="사유 (unsubscribe, bounce 등)")
+
+    commands.add_parser("report", help="최근 실행에서 건너뛴 중복/수신 거부 행, 발송 확인이 필요한 이메일 보기")
+
+    clear_parser = commands.add_parser(
+        "clear-unconfirmed", help="발송 도중 중단된 기록 삭제 (발송되지 않은 것을 확인한 뒤 사용, 다음 실행 때 다시 발송)"
+    )
+    clear_parser.add_argument("emails", nargs="*", help="삭제할 이메일 (생략하면 전부)")
+    clear_parser.add_argument("--campaign", help="캠페인 ID (생략하면 모든 캠페인)")
+
+    args = parser.parse_args()
+
+    with SendLedger(args.db, campaign="") as ledger:
+        if args.command == "suppress":
+            count = ledger.suppress(read_emails(args.path), args.reason)
+            print(f"수신 거부 목록에 {count}건 등록했습니다.")
+        elif args.command == "clear-unconfirmed":
+            count = ledger.clear_unconfirmed(args.emails or None, args.campaign)
+            print(f"발송 도중 중단된 기록 {count}건을 삭제했습니다. 다음 실행 때 다시 발송됩니다.")
+        else:
+            last = ledger.last_skipped_run()
+            if last:
+                for row_idx, email, reason in ledger.skipped_rows(last):
+                    print(f"[행 {row_idx}] {email} - {reason}")
+            else:
+                print("건너뛴 행이 없습니다.")
+
+            unconfirmed = ledger.unconfirmed()
+            if unconfirmed:
+                print("\n발송 도중 중단되어 발송 여부 확인이 필요한 이메일 (clear-unconfirmed로 삭제하면 다시 발송):")
+                for campaign, email, row_idx, updated_at in unconfirmed:
+                    print(f"  [행 {row_idx}] {email} ({updated_at}, 캠페인: {campaign})")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,17 +4,32 @@
 Google Sheets에서 고객 리스트를 읽어 개인화된 이메일을 발송합니다.
 """
 
+import argparse
+import cProfile
+import hashlib
+import json
 import os
-import smtplib
+import pstats
+import signal
+import sys
+import time
+from contextlib import ExitStack
 from datetime import datetime
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.utils import formataddr
 
 import gspread
 from dotenv import load_dotenv
 from google.oauth2.service_account import Credentials
 
+from fake_sheet import CSVWorksheet
+from ledger import ALREADY_SENT, CLAIMED, DUPLICATE, SUPPRESSED, UNCONFIRMED, SendLedger
+from metrics import InstrumentedWorksheet, RunMetrics, failure_reason
+from multi_sender import STATE_LABELS, MultiSender, SenderAccount, parse_sender_accounts
+from pipeline import Counters, RateLimiter, run_pipeline
+from sheet_reader import ResumeCursor, iter_sheet_rows
+from sheet_writer import ResultWriter
+from smtp_pool import SMTPConnectionPool
+from template_engine import MessageBuilder
+
 # 환경변수 로드
 load_dotenv()
 
@@ -23,6 +38,73 @@ GMAIL_ID = os.getenv("GMAIL_ID")
 GMAIL_APP_PASSWORD = os.getenv("GMAIL_APP_PASSWORD")
 SENDER_NAME = os.getenv("SENDER_NAME", "발신자")
 
+# 시트 백엔드 (google: Google Sheets, csv: 로컬 CSV 파일로 모의 실행)
+SHEET_BACKEND = os.getenv("SHEET_BACKEND", "google")
+SHEET_CSV_PATH = os.getenv("SHEET_CSV_PATH", "test_sheet.csv")
+# 재개 위치와 기본 캠페인 ID에 쓰는 시트 식별자
+SHEET_KEY = SHEET_CSV_PATH if SHEET_BACKEND == "csv" else GOOGLE_SHEET_URL
+
+# 로컬 상태 파일 폴더 (발송시간 기록 저널, 일일 발송 건수, 재개 위치, 발송 원장, 헤더 스타일 적용 기록)
+STATE_DIR = os.getenv("MAILER_STATE_DIR", os.path.dirname(os.path.abspath(__file__)))
+
+# 동시 발송 설정 (Gmail 일반 계정 하루 500건, Workspace 계정 하루 2,000건 제한)
+SEND_WORKERS = int(os.getenv("SEND_WORKERS", "4"))
+SEND_RATE_PER_SECOND = float(os.getenv("SEND_RATE_PER_SECOND", "2"))
+SEND_DAILY_LIMIT = int(os.getenv("SEND_DAILY_LIMIT", "500"))
+# 일일 발송 건수는 계정별로 STATE_DIR의 send_quota_<이메일>.json에 저장
+
+# 여러 발신 계정으로 나눠 발송 (형식: 이메일:앱비밀번호[:일일한도], 쉼표로 구분, 한도 생략 시 SEND_DAILY_LIMIT)
+# 2개 이상이면 계정마다 별도 프로세스로 발송, 비어 있으면 GMAIL_ID 한 계정으로 발송
+SENDER_ACCOUNTS = parse_sender_accounts(os.getenv("SENDER_ACCOUNTS", ""), SEND_DAILY_LIMIT) or [
+    SenderAccount(GMAIL_ID, GMAIL_APP_PASSWORD, SEND_DAILY_LIMIT)
+]
+# 계정/서버 오류가 연속 N번 난 계정은 물러나고, 그 계정의 행은 다른 계정이 발송 (N초 후 다시 시도)
+SENDER_MAX_FAILURES = int(os.getenv("SENDER_MAX_FAILURES", "5"))
+SENDER_RETRY_SECONDS = float(os.getenv("SENDER_RETRY_SECONDS", "600"))
+
+# 감시 모드 (python3 main.py --watch): 새로 추가된 행을 확인하는 주기(초)
+WATCH_INTERVAL = float(os.getenv("WATCH_INTERVAL", "60"))
+
+# 헤더 스타일 적용 여부를 기억하는 파일 (같은 시트/헤더/스타일이면 다시 적용하지 않음)
+HEADER_STYLE_PATH = os.path.join(STATE_DIR, "header_style.json")
+
+# 실행 리포트 (단계별 시간, 발송 지연 분포 등의 이벤트 로그/요약 파일 폴더)
+REPORT_DIR = os.getenv("MAILER_REPORT_DIR", os.path.join(STATE_DIR, "reports"))
+# 1이면 cProfile 결과(run_<시각>.prof)도 함께 저장
+MAILER_PROFILE = os.getenv("MAILER_PROFILE", "0") == "1"
+
+# SMTP 연결 풀 설정 (기본값: Gmail, 워커 수만큼 연결 유지)
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "465"))
+SMTP_USE_SSL = os.getenv("SMTP_USE_SSL", "1") != "0"
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", str(SEND_WORKERS)))
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+
+# 발송시간 일괄 기록 설정
+RESULT_FLUSH_ROWS = int(os.getenv("RESULT_FLUSH_ROWS", "20"))
+RESULT_FLUSH_SECONDS = float(os.getenv("RESULT_FLUSH_SECONDS", "10"))
+SENT_JOURNAL_PATH = os.path.join(STATE_DIR, "sent_journal.log")
+
+# 발송 원장 설정 (캠페인 + 이메일 단위 중복 발송 방지, 기본 캠페인: 시트 주소/CSV 경로)
+CAMPAIGN_ID = os.getenv("CAMPAIGN_ID") or SHEET_KEY
+SEND_LEDGER_PATH = os.path.join(STATE_DIR, "send_ledger.db")
+
+# 시트 분할 읽기 설정 (한 번에 읽을 행 수, 첫 미발송 행 위치 저장 파일)
+SHEET_CHUNK_SIZE = int(os.getenv("SHEET_CHUNK_SIZE", "500"))
+SHEET_CURSOR_PATH = os.path.join(STATE_DIR, "sheet_cursor.json")
+
+# 이메일 템플릿 폴더 (cold_email.html, cold_email_subject.txt)
+EMAIL_TEMPLATE_DIR = os.getenv("EMAIL_TEMPLATE_DIR", os.path.join(os.path.dirname(__file__), "templates"))
+
+# 시트 헤더와 스타일
+HEADER_RANGE = "A1:D1"
+EXPECTED_HEADERS = ["이메일", "회사명", "대표자명", "발송시간"]
+HEADER_FORMAT = {
+    "backgroundColor": {"red": 0.2, "green": 0.4, "blue": 0.8},
+    "textFormat": {"bold": True, "foregroundColor": {"red": 1, "green": 1, "blue": 1}},
+    "horizontalAlignment": "CENTER",
+}
+
 # Google Sheets API 스코프
 SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets",
@@ -30,93 +112,21 @@ SCOPES = [
 ]
 
 
-def get_email_template(company_name: str, representative_name: str) -> str:
-    """개인화된 이메일 HTML 템플릿 생성"""
-    return f"""
-<!DOCTYPE html>
-<html lang="ko">
-<head>
-    <meta charset="UTF-8">
-    <style>
-        body {{
-            font-family: 'Apple SD Gothic Neo', 'Malgun Gothic', sans-serif;
-            line-height: 1.8;
-            color: #333;
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        .greeting {{
-            margin-bottom: 20px;
-        }}
-        .content {{
-            margin-bottom: 30px;
-        }}
-        .signature {{
-            border-top: 1px solid #e0e0e0;
-            padding-top: 20px;
-            margin-top: 30px;
-        }}
-        .signature-card {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            border-radius: 10px;
-            padding: 20px;
-            color: white;
-        }}
-        .signature-name {{
-            font-size: 18px;
-            font-weight: bold;
-            margin-bottom: 5px;
-        }}
-        .signature-title {{
-            font-size: 14px;
-            opacity: 0.9;
-            margin-bottom: 15px;
-        }}
-        .signature-info {{
-            font-size: 13px;
-            opacity: 0.85;
-        }}
-        .signature-info p {{
-            margin: 3px 0;
-        }}
-    </style>
-</head>
-<body>
-    <div class="greeting">
-        <p>안녕하세요, <strong>{company_name}</strong> {representative_name} 대표님.</p>
-    </div>
-
-    <div class="content">
-        <p>바쁘신 와중에 메일 드려 죄송합니다.</p>
-
-        <p>저희는 기업의 비즈니스 성장을 돕는 솔루션을 제공하고 있습니다.</p>
-
-        <p>{company_name}의 사업 현황을 살펴보고, 귀사에 도움이 될 수 있는 부분이 있을 것 같아 연락드렸습니다.</p>
-
-        <p>짧게 10분 정도 통화가 가능하시다면, 구체적인 협업 방안을 말씀드리고 싶습니다.</p>
-
-        <p>편하신 시간에 회신 부탁드립니다.</p>
-
-        <p>감사합니다.</p>
-    </div>
-
-    <div class="signature">
-        <div class="signature-card">
-            <div class="signature-name">{SENDER_NAME}</div>
-            <div class="signature-title">Business Development</div>
-            <div class="signature-info">
-                <p>Email: {GMAIL_ID}</p>
-            </div>
-        </div>
-    </div>
-</body>
-</html>
-"""
+def load_message_builder() -> MessageBuilder:
+    """템플릿 파일을 읽어 발송 전체에 재사용할 메일 빌더 생성 (시작 시 1회)"""
+    return MessageBuilder.from_files(
+        os.path.join(EMAIL_TEMPLATE_DIR, "cold_email.html"),
+        os.path.join(EMAIL_TEMPLATE_DIR, "cold_email_subject.txt"),
+        SENDER_NAME,
+        SENDER_ACCOUNTS[0].email,
+    )
 
 
 def connect_to_sheet():
-    """Google Sheets에 연결하고 워크시트 반환"""
+    """Google Sheets에 연결하고 워크시트 반환 (SHEET_BACKEND=csv이면 로컬 CSV 워크시트)"""
+    if SHEET_BACKEND == "csv":
+        return CSVWorksheet(SHEET_CSV_PATH)
+
     # 서비스 계정 credentials.json이 있는 경우
     credentials_path = os.path.join(os.path.dirname(__file__), "credentials.json")
 
@@ -134,88 +144,206 @@ def connect_to_sheet():
     return worksheet
 
 
+def header_fingerprint() -> str:
+    """시트 주소 + 헤더 + 스타일의 지문 (하나라도 바뀌면 헤더를 다시 적용)"""
+    payload = json.dumps([SHEET_KEY, EXPECTED_HEADERS, HEADER_FORMAT], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 def apply_header_style(worksheet):
-    """헤더 행에 스타일 적용"""
+    """헤더 행에 스타일 적용 (이전에 같은 헤더/스타일을 적용했다면 API 호출 없이 건너뜀)"""
+    fingerprint = header_fingerprint()
+    try:
+        with open(HEADER_STYLE_PATH, encoding="utf-8") as f:
+            if json.load(f).get("fingerprint") == fingerprint:
+                print("헤더 스타일이 이미 적용되어 있습니다.")
+                return
+    except (OSError, ValueError):
+        pass
+
     # 헤더 확인 및 설정
     headers = worksheet.row_values(1)
-    expected_headers = ["이메일", "회사명", "대표자명", "발송시간"]
 
-    if not headers or headers != expected_headers:
-        worksheet.update("A1:D1", [expected_headers])
+    if not headers or headers != EXPECTED_HEADERS:
+        worksheet.update(HEADER_RANGE, [EXPECTED_HEADERS])
 
     # 헤더 스타일 적용 (배경색, 굵게)
-    worksheet.format("A1:D1", {
-        "backgroundColor": {"red": 0.2, "green": 0.4, "blue": 0.8},
-        "textFormat": {"bold": True, "foregroundColor": {"red": 1, "green": 1, "blue": 1}},
-        "horizontalAlignment": "CENTER",
-    })
+    worksheet.format(HEADER_RANGE, HEADER_FORMAT)
+
+    with open(HEADER_STYLE_PATH, "w", encoding="utf-8") as f:
+        json.dump({"fingerprint": fingerprint}, f)
 
     print("헤더 스타일이 적용되었습니다.")
 
 
-def send_email(to_email: str, company_name: str, representative_name: str) -> bool:
-    """이메일 발송"""
+def create_smtp_pool(metrics: RunMetrics = None) -> SMTPConnectionPool:
+    """Gmail 계정으로 로그인하는 SMTP 연결 풀 생성"""
+    account = SENDER_ACCOUNTS[0]
+    return SMTPConnectionPool(
+        SMTP_HOST,
+        SMTP_PORT,
+        account.email,
+        account.password,
+        size=SMTP_POOL_SIZE,
+        max_messages_per_connection=SMTP_MAX_MESSAGES_PER_CONNECTION,
+        use_ssl=SMTP_USE_SSL,
+        metrics=metrics,
+    )
+
+
+def create_multi_sender(metrics: RunMetrics = None) -> MultiSender:
+    """SENDER_ACCOUNTS의 계정마다 발송 프로세스를 띄우는 스케줄러 생성 (계정별 설정은 위 SMTP/발송 설정과 같음)"""
+    return MultiSender(
+        SENDER_ACCOUNTS,
+        {
+            "host": SMTP_HOST,
+            "port": SMTP_PORT,
+            "use_ssl": SMTP_USE_SSL,
+            "pool_size": SMTP_POOL_SIZE,
+            "max_messages_per_connection": SMTP_MAX_MESSAGES_PER_CONNECTION,
+            "workers": SEND_WORKERS,
+            "rate_per_second": SEND_RATE_PER_SECOND,
+            "max_failures": SENDER_MAX_FAILURES,
+            "state_dir": STATE_DIR,
+            "html_template": os.path.join(EMAIL_TEMPLATE_DIR, "cold_email.html"),
+            "subject_template": os.path.join(EMAIL_TEMPLATE_DIR, "cold_email_subject.txt"),
+            "sender_name": SENDER_NAME,
+        },
+        metrics=metrics,
+        retry_seconds=SENDER_RETRY_SECONDS,
+    )
+
+
+def send_email(
+    pool: SMTPConnectionPool,
+    builder: MessageBuilder,
+    to_email: str,
+    company_name: str,
+    representative_name: str,
+) -> bool:
+    """이메일 발송 (연결 풀의 로그인된 연결 재사용, 소요 시간/실패 사유는 풀의 계측기에 기록)"""
     try:
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = f"[{company_name}] 비즈니스 협업 제안"
-        msg["From"] = formataddr((SENDER_NAME, GMAIL_ID))
-        msg["To"] = to_email
-
-        html_content = get_email_template(company_name, representative_name)
-        msg.attach(MIMEText(html_content, "html", "utf-8"))
-
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-            server.login(GMAIL_ID, GMAIL_APP_PASSWORD)
-            server.sendmail(GMAIL_ID, to_email, msg.as_string())
+        with pool.metrics.stage("render"):
+            message = builder.build(
+                to_email,
+                company_name=company_name,
+                representative_name=representative_name,
+            )
+        pool.send(pool.username, to_email, message)
 
         return True
     except Exception as e:
+        pool.metrics.count_failure(f"send {failure_reason(e)}")
         print(f"이메일 발송 실패 ({to_email}): {e}")
         return False
 
 
-def main():
-    """메인 실행 함수"""
+def handle_hangup(signum, frame):
+    """실행 창이 닫혔을 때(SIGHUP): 터미널이 없어졌으므로 이후 출력은 버리고 Ctrl+C와 같이 마무리 후 종료"""
+    sys.stdout = sys.stderr = open(os.devnull, "w", encoding="utf-8")
+    raise KeyboardInterrupt
+
+
+def main(worksheet=None, watch: bool = False):
+    """메인 실행 함수 (worksheet를 넘기면 시트 연결 대신 사용, watch=True이면 감시 모드)"""
     print("=" * 50)
     print("콜드 메일 자동화 시스템 시작")
     print("=" * 50)
 
     # 환경변수 검증
-    if not all([GOOGLE_SHEET_URL, GMAIL_ID, GMAIL_APP_PASSWORD]):
+    if not SHEET_KEY or not all(account.email and account.password for account in SENDER_ACCOUNTS):
         print("오류: .env 파일에 필수 환경변수를 설정해주세요.")
         print("  - GOOGLE_SHEET_URL")
         print("  - GMAIL_ID")
         print("  - GMAIL_APP_PASSWORD")
+        print("    (여러 계정으로 나눠 보낼 때는 SENDER_ACCOUNTS)")
         return
 
-    # Google Sheets 연결
-    print("\nGoogle Sheets 연결 중...")
+    # 종료 신호(SIGTERM)와 창 닫기(SIGHUP)도 Ctrl+C와 같이 진행 중인 작업을 마무리한 뒤 종료 (계정 프로세스도 함께 정리)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, handle_hangup)
+
+    metrics = RunMetrics(REPORT_DIR)
+    profiler = cProfile.Profile() if MAILER_PROFILE else None
+    worker_profilers = [] if MAILER_PROFILE else None
+    if profiler:
+        profiler.enable()
+
+    counters = None
     try:
-        worksheet = connect_to_sheet()
-        print("연결 성공!")
-    except Exception as e:
-        print(f"Google Sheets 연결 실패: {e}")
-        return
+        counters = run(worksheet, metrics, worker_profilers, watch)
+    finally:
+        if profiler:
+            profiler.disable()
+            stats = pstats.Stats(profiler)
+            for worker_profiler in worker_profilers:
+                stats.add(worker_profiler)
+            stats.dump_stats(metrics.path("prof"))
+        metrics.close(counters.as_dict() if counters else None)
+        print(f"\n실행 리포트: {metrics.path('summary.json')}")
+
+
+def run(worksheet, metrics: RunMetrics, worker_profilers: list = None, watch: bool = False):
+    """템플릿 로드, 시트 연결, 발송까지 한 번의 실행 (처리 결과 집계 반환)
+
+    감시 모드에서도 인증/시트 연결, 헤더 확인, SMTP 로그인은 시작할 때 한 번만 합니다.
+    """
+    # 이메일 템플릿 로드
+    try:
+        with metrics.stage("load_templates", log=True):
+            builder = load_message_builder()
+    except (OSError, ValueError) as e:
+        print(f"이메일 템플릿 로드 실패: {e}")
+        return None
+
+    # Google Sheets 연결
+    if worksheet is None:
+        print("\nGoogle Sheets 연결 중...")
+        try:
+            with metrics.stage("connect_to_sheet", log=True):
+                worksheet = connect_to_sheet()
+            print("연결 성공!")
+        except Exception as e:
+            metrics.count_failure(f"connect_to_sheet {failure_reason(e)}")
+            print(f"Google Sheets 연결 실패: {e}")
+            return None
+
+    # 이후 모든 시트 API 호출의 횟수와 소요 시간 기록
+    worksheet = InstrumentedWorksheet(worksheet, metrics)
 
     # 헤더 스타일 적용
-    apply_header_style(worksheet)
+    with metrics.stage("apply_header_style", log=True):
+        apply_header_style(worksheet)
+
+    # 발송시간 기록 버퍼 (이전 실행에서 기록하지 못한 발송시간 먼저 반영)
+    writer = ResultWriter(
+        worksheet,
+        SENT_JOURNAL_PATH,
+        sheet_key=SHEET_KEY,
+        flush_rows=RESULT_FLUSH_ROWS,
+        flush_seconds=RESULT_FLUSH_SECONDS,
+    )
+    writer.flush()
 
-    # 데이터 읽기 (2행부터)
-    all_records = worksheet.get_all_values()
+    try:
+        return process_rows(worksheet, writer, builder, metrics, worker_profilers, watch)
+    finally:
+        writer.close()
 
-    if len(all_records) <= 1:
-        print("\n발송할 데이터가 없습니다.")
-        return
 
-    sent_count = 0
-    skipped_count = 0
-    failed_count = 0
+def iter_pending_rows(rows, writer: ResultWriter, counters: Counters, cursor: ResumeCursor, ledger: SendLedger):
+    """발송 대상 행만 골라 (행 번호, 이메일, 회사명, 대표자명)으로 반환"""
+    for row_idx, row in rows:
+        cursor.seen(row_idx)
 
-    print(f"\n총 {len(all_records) - 1}개의 데이터를 처리합니다.\n")
+        # 완전히 빈 행(구분용 빈 줄 등)은 재개 위치를 붙잡지 않고 건너뜀
+        if not any(cell.strip() for cell in row):
+            continue
 
-    for row_idx, row in enumerate(all_records[1:], start=2):
         if len(row) < 3:
-            print(f"[행 {row_idx}] 데이터 부족, 건너뜀")
+            counters.report(f"[행 {row_idx}] 데이터 부족, 건너뜀")
+            cursor.mark_incomplete(row_idx)
             continue
 
         email = row[0].strip()
@@ -225,34 +353,221 @@ def main():
 
         # 발송시간이 있으면 이미 발송된 것이므로 건너뜀
         if sent_time:
-            print(f"[행 {row_idx}] {company_name} - 이미 발송됨 ({sent_time}), 건너뜀")
-            skipped_count += 1
+            if email:
+                ledger.mark_sent(email, row_idx)
+            counters.report(f"[행 {row_idx}] {company_name} - 이미 발송됨 ({sent_time}), 건너뜀", "skipped")
+            continue
+
+        # 발송은 되었지만 시트 기록이 아직 반영되지 않은 행
+        if writer.is_recorded(row_idx):
+            counters.report(f"[행 {row_idx}] {company_name} - 이미 발송됨 (기록 대기 중), 건너뜀", "skipped")
             continue
 
         if not email or not company_name or not representative_name:
-            print(f"[행 {row_idx}] 필수 정보 누락, 건너뜀")
+            counters.report(f"[행 {row_idx}] 필수 정보 누락, 건너뜀")
+            cursor.mark_incomplete(row_idx)
+            continue
+
+        # 발송이 끝날 때까지 다음 실행의 시작 행이 이 행을 넘지 않도록 표시
+        cursor.open(row_idx)
+
+        # 원장에 발송 의도 기록 (같은 이메일이 이미 발송/발송 중이면 건너뜀)
+        claim = ledger.claim(email, row_idx)
+        if claim != CLAIMED:
+            # 발송 여부 확인이 필요한 행은 열어 둠 (clear-unconfirmed 후 다음 실행에서 다시 읽도록)
+            if claim != UNCONFIRMED:
+                cursor.close(row_idx)
+            if claim == SUPPRESSED:
+                counters.report(f"[행 {row_idx}] {company_name} - {email} 수신 거부/반송 목록, 건너뜀", "suppressed")
+            elif claim in (DUPLICATE, ALREADY_SENT):
+                counters.report(f"[행 {row_idx}] {company_name} - {email} 중복 이메일 (이미 발송됨), 건너뜀", "duplicate")
+            else:
+                counters.report(
+                    f"[행 {row_idx}] {company_name} - {email} 이전 실행이 발송 도중 중단됨 (발송 여부 확인 필요), 건너뜀",
+                    "duplicate",
+                )
             continue
 
-        print(f"[행 {row_idx}] {company_name} ({representative_name}) - {email} 발송 중...", end=" ")
+        yield row_idx, email, company_name, representative_name
 
-        if send_email(email, company_name, representative_name):
-            # 발송 성공 시 시간 기록
+
+def watch_new_rows(
+    send_from, cursor: ResumeCursor, writer: ResultWriter, metrics: RunMetrics, seconds_until_ready, completed: bool
+) -> bool:
+    """종료 요청이 올 때까지 WATCH_INTERVAL초마다 마지막으로 읽은 행 다음 범위만 확인해 새 행 발송
+
+    새 행이 없으면 주기마다 시트 읽기 1회만 발생합니다.
+    """
+    print(f"\n감시 모드: {WATCH_INTERVAL:g}초마다 새로 추가된 행을 확인합니다. (Ctrl+C로 종료)")
+    while True:
+        if completed:
+            time.sleep(WATCH_INTERVAL)
+            start_row = cursor.scan_row
+        else:
+            # 일일 한도 도달(또는 발송 가능한 계정 없음): 다시 보낼 수 있을 때까지 기다린 뒤 첫 미발송 행부터 다시 확인
+            wait = seconds_until_ready()
+            print(f"\n일일 발송 한도에 도달했습니다. {wait / 3600:.1f}시간 후 다시 발송합니다.")
+            time.sleep(wait)
+            start_row = cursor.next_row
+
+        # 발송이 없는 동안에도 모아둔 발송시간, 재개 위치, 이벤트 로그 반영
+        writer.maybe_flush()
+        cursor.save()
+        metrics.flush()
+
+        try:
+            completed = send_from(start_row)
+        except Exception as e:
+            # 시트 API 일시 오류 등은 다음 주기에 다시 시도
+            print(f"새 행 확인 실패 (다음 주기에 다시 시도): {e}")
+            completed = True
+
+
+def process_rows(
+    worksheet,
+    writer: ResultWriter,
+    builder: MessageBuilder,
+    metrics: RunMetrics,
+    worker_profilers: list = None,
+    watch: bool = False,
+) -> Counters:
+    """시트를 나눠 읽으며 미발송 행에 메일 발송 (SEND_WORKERS개 워커가 동시에 발송)
+
+    SENDER_ACCOUNTS가 2개 이상이면 계정별 프로세스가 행을 나눠 발송하고, 결과는 이 프로세스에서 시트와 집계에 반영합니다.
+    watch=True이면 종료 요청(Ctrl+C, SIGTERM)이 올 때까지 새로 추가된 행을 계속 발송합니다.
+    """
+    # 이전 실행의 첫 미발송 행부터 읽기
+    cursor = ResumeCursor(SHEET_CURSOR_PATH, SHEET_KEY)
+    ledger = SendLedger(SEND_LEDGER_PATH, CAMPAIGN_ID)
+
+    counters = Counters()
+
+    print(f"\n{cursor.start_row}행부터 데이터를 처리합니다. ({SHEET_CHUNK_SIZE}행씩 읽기)\n")
+
+    def finish(job, ok: bool, seconds: float, sender: str = None, reason: str = None):
+        row_idx, email, company_name, representative_name = job
+        via = f" [{sender}]" if sender else ""
+        line = f"[행 {row_idx}] {company_name} ({representative_name}) - {email}{via} 발송 중..."
+        metrics.record_message(row_idx, seconds, ok)
+
+        if ok:
+            # 발송 성공 시 시간 기록 (모아서 일괄 반영)
+            # 저널에 먼저 남긴 뒤 원장을 완료로 바꿈 (그 사이 종료되면 원장은 발송 의도로 남고 저널로 발송시간 복구)
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            worksheet.update_cell(row_idx, 4, current_time)
-            print(f"성공!")
-            sent_count += 1
+            with metrics.stage("record_result"):
+                writer.record(row_idx, email, current_time)
+            ledger.confirm(email)
+            cursor.close(row_idx)
+            counters.report(f"{line} 성공!", "sent")
         else:
-            print(f"실패")
-            failed_count += 1
+            ledger.release(email)
+            counters.report(f"{line} 실패" + (f" ({reason})" if reason else ""), "failed")
+
+    def drop(job):
+        # 일일 한도/중단으로 발송하지 못한 행은 원장의 발송 의도 기록을 되돌림
+        ledger.release(job[1])
+
+    def hold(job, sender: str):
+        # 발송 도중 계정 프로세스가 종료된 행은 발송 여부를 알 수 없으므로 원장에 발송 의도로 남김 (다시 보내지 않음)
+        row_idx, email, company_name, representative_name = job
+        ledger.hold(email)
+        counters.report(
+            f"[행 {row_idx}] {company_name} ({representative_name}) - {email} [{sender}] "
+            "발송 도중 계정 프로세스 종료 (발송 여부 확인 필요: python3 ledger.py report)",
+            "failed",
+        )
+
+    with ExitStack() as stack:
+        if len(SENDER_ACCOUNTS) > 1:
+            # 계정마다 별도 프로세스로 발송 (시트/원장/재개 위치는 이 프로세스에서만 다룸)
+            sender = stack.enter_context(create_multi_sender(metrics))
+            counters.senders = sender.senders
+            seconds_until_ready = sender.seconds_until_available
+            print(f"발신 계정 {len(SENDER_ACCOUNTS)}개로 나눠 발송합니다.\n")
+
+            def send_jobs(jobs) -> bool:
+                return sender.run(jobs, finish, drop, hold)
+        else:
+            # 로그인된 SMTP 연결을 발송 전체에 걸쳐 재사용
+            pool = stack.enter_context(create_smtp_pool(metrics))
+            limiter = RateLimiter(
+                SEND_RATE_PER_SECOND,
+                burst=SEND_WORKERS,
+                daily_limit=SENDER_ACCOUNTS[0].daily_limit,
+                state_path=SENDER_ACCOUNTS[0].quota_path(STATE_DIR),
+            )
+            seconds_until_ready = limiter.seconds_until_reset
+
+            def handle(job):
+                start = time.perf_counter()
+                ok = send_email(pool, builder, *job[1:])
+                finish(job, ok, time.perf_counter() - start)
+
+            def send_jobs(jobs) -> bool:
+                return run_pipeline(
+                    jobs,
+                    handle,
+                    workers=SEND_WORKERS,
+                    limiter=limiter,
+                    profilers=worker_profilers,
+                    on_drop=drop,
+                )
+
+        def send_from(start_row: int) -> bool:
+            # 행은 필요한 만큼만 나눠 읽어 큐로 전달 (시트 크기와 관계없이 메모리 사용량 일정)
+            rows = iter_sheet_rows(worksheet, start_row, chunk_size=SHEET_CHUNK_SIZE)
+            return send_jobs(iter_pending_rows(rows, writer, counters, cursor, ledger))
+
+        try:
+            completed = send_from(cursor.start_row)
+            if watch:
+                completed = watch_new_rows(send_from, cursor, writer, metrics, seconds_until_ready, completed)
+        except KeyboardInterrupt:
+            if not watch:
+                raise
+            print("\n종료 요청을 받았습니다. 진행 중인 작업을 마무리합니다...")
+            completed = True
+        finally:
+            stack.close()
+            cursor.save()
+            skipped_rows = ledger.skipped_rows()
+            ledger.close()
+
+    if cursor.last_row < cursor.start_row:
+        print("\n발송할 데이터가 없습니다.")
+
+    if not completed:
+        if counters.senders:
+            print("\n모든 발신 계정이 일일 발송 한도에 도달했거나 오류로 중단되어 발송을 멈췄습니다. 남은 행은 다음 실행 때 발송됩니다.")
+        else:
+            print(f"\n일일 발송 한도({SENDER_ACCOUNTS[0].daily_limit}건)에 도달하여 발송을 중단했습니다. 남은 행은 다음 실행 때 발송됩니다.")
 
     # 결과 요약
     print("\n" + "=" * 50)
     print("처리 완료!")
-    print(f"  - 발송 성공: {sent_count}건")
-    print(f"  - 건너뜀 (이미 발송): {skipped_count}건")
-    print(f"  - 발송 실패: {failed_count}건")
+    print(f"  - 발송 성공: {counters.sent}건")
+    print(f"  - 건너뜀 (이미 발송): {counters.skipped}건")
+    print(f"  - 건너뜀 (중복 이메일): {counters.duplicate}건")
+    print(f"  - 건너뜀 (수신 거부/반송): {counters.suppressed}건")
+    print(f"  - 발송 실패: {counters.failed}건")
+    for email, result in counters.senders.items():
+        state = STATE_LABELS.get(result["state"], result["state"])
+        print(
+            f"    · {email}: 성공 {result['sent']}건, 실패 {result['failed']}건, "
+            f"다른 계정으로 넘김 {result['handed_off']}건 ({state})"
+        )
     print("=" * 50)
 
+    if skipped_rows:
+        print("\n건너뛴 중복/수신 거부 행:")
+        for row_idx, email, reason in skipped_rows:
+            print(f"  [행 {row_idx}] {email} - {reason}")
+
+    return counters
+
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="콜드 메일 자동화 시스템")
+    parser.add_argument("--watch", action="store_true", help="종료할 때까지 새로 추가된 행을 계속 발송 (감시 모드)")
+    args = parser.parse_args()
+    main(watch=args.watch)
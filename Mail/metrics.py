@@ -0,0 +1,229 @@
+"""
+실행 계측
+단계별 소요 시간, 메일 1건 발송 지연 분포, API 호출 횟수, 재시도/실패 사유를 모아
+JSON Lines 이벤트 로그와 실행 요약 파일(JSON)로 저장합니다.
+"""
+
+import bisect
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+# 발송 지연 히스토그램 구간 상한(ms)
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+# 백분위 계산용으로 보관하는 발송 지연 표본 수 (감시 모드처럼 오래 실행해도 메모리 사용량 일정)
+LATENCY_SAMPLE_SIZE = 10000
+# 이벤트 로그를 디스크에 반영하는 주기(초) (감시 모드처럼 오래 실행하다 비정상 종료되어도 로그가 남도록)
+EVENTS_FLUSH_SECONDS = 5
+
+
+def failure_reason(error: Exception) -> str:
+    """예외를 집계용 실패 사유 문자열로 변환 (SMTP 응답 코드 포함)"""
+    code = getattr(error, "smtp_code", None)
+    return f"{type(error).__name__} {code}" if code else type(error).__name__
+
+
+def _percentile(sorted_values: list, ratio: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * ratio))]
+
+
+class RunMetrics:
+    """한 번의 실행 동안 계측값을 모으는 스레드 안전 집계기
+
+    report_dir를 지정하면 run_<시각>.events.jsonl(이벤트 로그)과 run_<시각>.summary.json(요약)을 기록합니다.
+    지정하지 않으면 메모리에만 집계합니다.
+    """
+
+    def __init__(self, report_dir: str = None):
+        # 같은 초에 시작한 실행끼리 리포트 파일이 겹치지 않도록 마이크로초까지 포함
+        self.run_id = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        self.report_dir = report_dir
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.api_calls = Counter()
+        self.failures = Counter()
+        self.retries = Counter()
+        self.results = Counter()
+        # 발송 지연: 건수/최대값/히스토그램은 전체, 백분위는 균등 표본(reservoir sampling)으로 계산
+        self.latency_count = 0
+        self.latency_max_ms = 0.0
+        self.latency_sample = []
+        self._random = random.Random()
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+        self._events = None
+        self._events_flushed = time.monotonic()
+        if report_dir:
+            os.makedirs(report_dir, exist_ok=True)
+            self._events = open(self.path("events.jsonl"), "w", encoding="utf-8")
+        self.event("run_start")
+
+    def path(self, suffix: str) -> str:
+        return os.path.join(self.report_dir, f"run_{self.run_id}.{suffix}")
+
+    def event(self, name: str, /, **fields):
+        """이벤트 로그에 한 줄 기록 (EVENTS_FLUSH_SECONDS초마다 디스크에 반영)"""
+        if self._events is None:
+            return
+        fields = {"event": name, "t": round(time.perf_counter() - self._start, 6), **fields}
+        line = json.dumps(fields, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._events is not None:
+                self._events.write(line)
+                if time.monotonic() - self._events_flushed >= EVENTS_FLUSH_SECONDS:
+                    self._flush_events()
+
+    def _flush_events(self):
+        self._events.flush()
+        self._events_flushed = time.monotonic()
+
+    def flush(self):
+        """기록한 이벤트를 디스크에 반영 (발송이 없는 동안에도 감시 주기마다 호출)"""
+        with self._lock:
+            if self._events is not None:
+                self._flush_events()
+
+    def add_stage(self, name: str, seconds: float):
+        """단계 소요 시간 누적 (횟수, 합계, 최대)"""
+        with self._lock:
+            stage = self.stages.get(name)
+            if stage is None:
+                stage = self.stages[name] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            ms = seconds * 1000
+            stage["count"] += 1
+            stage["total_ms"] += ms
+            stage["max_ms"] = max(stage["max_ms"], ms)
+
+    @contextmanager
+    def stage(self, name: str, log: bool = False):
+        """with 블록의 소요 시간을 name 단계로 기록 (log=True이면 이벤트 로그에도 기록)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.add_stage(name, seconds)
+            if log:
+                self.event("stage", stage=name, ms=round(seconds * 1000, 3))
+
+    def count_call(self, name: str):
+        with self._lock:
+            self.api_calls[name] += 1
+
+    def count_failure(self, reason: str):
+        with self._lock:
+            self.failures[reason] += 1
+
+    def count_retry(self, name: str, reason: str = ""):
+        with self._lock:
+            self.retries[name] += 1
+        self.event("retry", name=name, reason=reason)
+
+    def record_message(self, row_idx: int, seconds: float, ok: bool, reason: str = None):
+        """메일 1건의 발송 결과와 지연 기록"""
+        ms = seconds * 1000
+        with self._lock:
+            self.results["sent" if ok else "failed"] += 1
+            self.latency_count += 1
+            self.latency_max_ms = max(self.latency_max_ms, ms)
+            if len(self.latency_sample) < LATENCY_SAMPLE_SIZE:
+                self.latency_sample.append(ms)
+            else:
+                slot = self._random.randrange(self.latency_count)
+                if slot < LATENCY_SAMPLE_SIZE:
+                    self.latency_sample[slot] = ms
+            self.histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+            if reason:
+                self.failures[reason] += 1
+        self.event("message", row=row_idx, ok=ok, ms=round(ms, 3), reason=reason)
+
+    def merge(self, summary: dict):
+        """다른 프로세스의 실행 요약(summary())에서 단계 시간, API 호출, 실패/재시도 횟수 합산"""
+        with self._lock:
+            for name, other in summary["stages"].items():
+                stage = self.stages.get(name)
+                if stage is None:
+                    stage = self.stages[name] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+                stage["count"] += other["count"]
+                stage["total_ms"] += other["total_ms"]
+                stage["max_ms"] = max(stage["max_ms"], other["max_ms"])
+            self.api_calls.update(summary["api_calls"])
+            self.failures.update(summary["failures"])
+            self.retries.update(summary["retries"])
+
+    def summary(self, counts: dict = None) -> dict:
+        """실행 요약 (counts: 발송/건너뜀 등 최종 집계)"""
+        with self._lock:
+            latencies = sorted(self.latency_sample)
+            labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+            stages = {
+                name: {**stage, "avg_ms": stage["total_ms"] / stage["count"]}
+                for name, stage in self.stages.items()
+            }
+            return {
+                "run_id": self.run_id,
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "finished_at": datetime.now().isoformat(timespec="seconds"),
+                "elapsed_s": time.perf_counter() - self._start,
+                "counts": counts or dict(self.results),
+                "stages": stages,
+                "api_calls": dict(self.api_calls),
+                "message_latency_ms": {
+                    "count": self.latency_count,
+                    "p50": _percentile(latencies, 0.50),
+                    "p90": _percentile(latencies, 0.90),
+                    "p99": _percentile(latencies, 0.99),
+                    "max": self.latency_max_ms,
+                    "histogram": dict(zip(labels, self.histogram)),
+                },
+                "failures": dict(self.failures),
+                "retries": dict(self.retries),
+            }
+
+    def close(self, counts: dict = None) -> dict:
+        """요약 파일을 쓰고 이벤트 로그를 닫은 뒤 요약 반환"""
+        summary = self.summary(counts)
+        self.event("run_end", elapsed_s=round(summary["elapsed_s"], 3))
+        if self.report_dir:
+            with open(self.path("summary.json"), "w", encoding="utf-8") as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+        if self._events is not None:
+            with self._lock:
+                self._events.close()
+                self._events = None
+        return summary
+
+
+class InstrumentedWorksheet:
+    """워크시트 API 호출마다 횟수와 소요 시간("sheet.<메서드>")을 기록하는 래퍼"""
+
+    def __init__(self, worksheet, metrics: RunMetrics):
+        self._worksheet = worksheet
+        self._metrics = metrics
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._worksheet, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            stage = f"sheet.{name}"
+            self._metrics.count_call(stage)
+            try:
+                with self._metrics.stage(stage):
+                    return attr(*args, **kwargs)
+            except Exception as e:
+                self._metrics.count_failure(f"{stage} {failure_reason(e)}")
+                raise
+
+        return call
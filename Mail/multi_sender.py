@@ -0,0 +1,522 @@
+"""
+여러 발신 계정으로 나눠 발송
+발신 계정마다 별도 프로세스(계정별 SMTP 연결 풀 + 일일 한도)를 띄우고, 부모 프로세스가 발송할 행을
+여유가 있는 계정에 하나씩 배정합니다. 행은 한 계정에만 배정(임대)되므로 같은 행을 두 계정이 보내지 않습니다.
+한도에 도달하거나 오류가 이어지는 계정은 물러나고, 그 계정이 맡았던 행은 다른 계정이 이어서 보냅니다.
+계정 프로세스와는 각자의 파이프로만 통신하므로, 한 프로세스가 비정상 종료되어도 나머지는 영향을 받지 않습니다.
+시트 읽기/기록, 발송 원장, 재개 위치, 집계는 모두 부모 프로세스에서만 처리합니다.
+"""
+
+import multiprocessing
+import multiprocessing.connection
+import os
+import re
+import signal
+import smtplib
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+from metrics import RunMetrics, failure_reason
+from pipeline import RateLimiter, run_pipeline
+from smtp_pool import SMTPConnectionPool
+from template_engine import MessageBuilder
+
+# 계정 프로세스 → 부모 메시지 종류 (종류, 행 또는 종료 정보, 소요 시간, 실패 사유)
+STARTED = "started"  # SMTP 발송 시작 직전 (이후 프로세스가 종료되면 발송 여부를 알 수 없음)
+SENT = "sent"        # 발송 성공
+FAILED = "failed"    # 수신 주소 문제 등으로 발송 실패 (다른 계정으로 보내도 같은 결과)
+RETRY = "retry"      # 계정/서버 오류로 발송 실패 (다른 계정으로 재시도)
+DROPPED = "dropped"  # 일일 한도/중단으로 보내지 않음 (다른 계정으로 넘김)
+STOPPED = "stopped"  # 계정 프로세스 종료
+
+# 부모 → 계정 프로세스: 행, 중단 요청(STOP), 종료(None)
+STOP = "stop"
+
+# 진행 중인 발송을 마무리한 뒤 종료하는 신호 (Ctrl+C, SIGTERM, 창 닫기)
+INTERRUPT_SIGNALS = tuple(
+    getattr(signal, name) for name in ("SIGINT", "SIGTERM", "SIGHUP") if hasattr(signal, name)
+)
+
+# 계정 프로세스 종료 사유
+STATE_LABELS = {
+    "done": "발송 완료",
+    "daily_limit": "일일 발송 한도 도달",
+    "failing": "발송 오류 반복",
+    "crashed": "프로세스 비정상 종료",
+}
+
+
+class SenderAccount:
+    """발신 계정 (Gmail 주소, 앱 비밀번호, 일일 발송 한도)"""
+
+    def __init__(self, email: str, password: str, daily_limit: int = 0):
+        self.email = email
+        self.password = password
+        self.daily_limit = daily_limit
+
+    def __repr__(self):
+        return f"SenderAccount({self.email!r}, daily_limit={self.daily_limit})"
+
+    def quota_path(self, state_dir: str) -> str:
+        """계정별 일일 발송 건수 저장 파일"""
+        return os.path.join(state_dir, f"send_quota_{re.sub(r'[^A-Za-z0-9@._-]', '_', self.email)}.json")
+
+
+def parse_sender_accounts(value: str, default_daily_limit: int = 0) -> list:
+    """"이메일:앱비밀번호[:일일한도],..." 형식의 설정을 발신 계정 목록으로 변환"""
+    accounts = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        parts = entry.split(":")
+        daily_limit = default_daily_limit
+        if len(parts) > 2 and parts[-1].strip().isdigit():
+            daily_limit = int(parts.pop().strip())
+        if len(parts) < 2 or "@" not in parts[0]:
+            raise ValueError(f"발신 계정 형식이 올바르지 않습니다 (이메일:앱비밀번호[:일일한도]): {parts[0]}")
+        accounts.append(SenderAccount(parts[0].strip(), ":".join(parts[1:]).strip(), daily_limit))
+    return accounts
+
+
+def is_sender_error(error: Exception) -> bool:
+    """계정/서버 쪽 오류인지 확인 (수신 주소 거부는 다른 계정으로 보내도 같으므로 제외)"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return False
+    return isinstance(error, (smtplib.SMTPException, OSError))
+
+
+def _next_midnight() -> float:
+    tomorrow = datetime.combine(datetime.now().date() + timedelta(days=1), datetime.min.time())
+    return tomorrow.timestamp()
+
+
+def _run_sender(account: SenderAccount, options: dict, conn):
+    """계정 프로세스 본체: 부모가 배정한 행을 발송하고 결과를 부모에게 보고"""
+    # 종료는 부모가 STOP/None으로 알림 (Ctrl+C/SIGTERM/창 닫기가 프로세스 그룹 전체에 전달되어도 진행 중인 발송은 마무리)
+    # 부모 프로세스가 없어지면 파이프가 닫히므로 남은 행을 버리고 종료
+    for signum in INTERRUPT_SIGNALS:
+        signal.signal(signum, signal.SIG_IGN)
+
+    metrics = RunMetrics()
+    retired = threading.Event()
+    stop = threading.Event()
+    lock = threading.Lock()
+    status = {"state": "done", "reason": None, "streak": 0}
+
+    def report(kind, job, seconds=0.0, reason=None):
+        # 여러 워커가 같은 파이프에 쓰므로 잠금, 보내기가 끝난 뒤에야 반환 (STARTED가 발송보다 먼저 전달됨)
+        with lock:
+            try:
+                conn.send((kind, job, seconds, reason))
+                return True
+            except OSError:
+                stop.set()
+                return False
+
+    def next_jobs():
+        while not (retired.is_set() or stop.is_set()):
+            try:
+                if not conn.poll(1):
+                    continue
+                job = conn.recv()
+            except (EOFError, OSError):
+                stop.set()
+                return
+            if job is None:
+                return
+            if job == STOP:
+                stop.set()
+                return
+            yield job
+
+    try:
+        builder = MessageBuilder.from_files(
+            options["html_template"], options["subject_template"], options["sender_name"], account.email
+        )
+        limiter = RateLimiter(
+            options["rate_per_second"],
+            burst=options["workers"],
+            daily_limit=account.daily_limit,
+            state_path=account.quota_path(options["state_dir"]),
+        )
+
+        with SMTPConnectionPool(
+            options["host"],
+            options["port"],
+            account.email,
+            account.password,
+            size=options["pool_size"],
+            max_messages_per_connection=options["max_messages_per_connection"],
+            use_ssl=options["use_ssl"],
+            metrics=metrics,
+        ) as pool:
+
+            def handle(job):
+                if retired.is_set() or stop.is_set() or not report(STARTED, job):
+                    # 보내지 않고 다른 계정에 넘기는 행은 이 계정의 일일 한도에서 되돌림
+                    limiter.release()
+                    report(DROPPED, job)
+                    return
+
+                start = time.perf_counter()
+                try:
+                    with metrics.stage("render"):
+                        message = builder.build(job[1], company_name=job[2], representative_name=job[3])
+                    pool.send(account.email, job[1], message)
+                except Exception as e:
+                    reason = failure_reason(e)
+                    metrics.count_failure(f"send {reason}")
+                    if not is_sender_error(e):
+                        report(FAILED, job, time.perf_counter() - start, reason)
+                        return
+                    # 계정 오류가 연속으로 max_failures번 나면 이 계정은 물러남
+                    with lock:
+                        status["streak"] += 1
+                        if status["streak"] >= options["max_failures"] and not retired.is_set():
+                            status.update(state="failing", reason=f"{reason}: {e}")
+                            retired.set()
+                    report(RETRY, job, time.perf_counter() - start, reason)
+                    return
+
+                with lock:
+                    status["streak"] = 0
+                report(SENT, job, time.perf_counter() - start)
+
+            if not run_pipeline(
+                next_jobs(),
+                handle,
+                workers=options["workers"],
+                limiter=limiter,
+                on_drop=lambda job: report(DROPPED, job),
+            ):
+                status.update(state="daily_limit", reason=None)
+    except Exception as e:
+        status.update(state="failing", reason=f"{failure_reason(e)}: {e}")
+    finally:
+        report(STOPPED, {"state": status["state"], "reason": status["reason"], "metrics": metrics.summary()})
+        conn.close()
+
+
+class MultiSender:
+    """발신 계정별 프로세스를 띄우고 발송할 행을 배정하는 스케줄러 (with 문으로 사용)
+
+    - run(jobs, on_result, on_drop, on_hold): jobs를 계정들에 나눠 발송하고 행마다 on_result(job, ok, 소요 시간, 계정, 사유) 호출
+    - 행은 진행 중인 행이 가장 적은 계정에 배정되며, 계정 오류로 실패한 행은 아직 시도하지 않은 계정에 다시 배정
+    - 일일 한도에 도달한 계정은 자정 이후, 오류로 물러난 계정은 retry_seconds초 후 다음 run()에서 다시 시작
+    - 발송 가능한 계정이 없으면 남은 행은 on_drop(job) 후 run()이 False 반환
+    - 발송을 시작한 뒤 계정 프로세스가 비정상 종료된 행은 발송 여부를 알 수 없으므로 on_hold(job, 계정) 호출
+    계정 프로세스는 close()까지 유지되므로 감시 모드에서도 로그인된 연결을 재사용합니다.
+    """
+
+    def __init__(self, accounts: list, options: dict, metrics: RunMetrics = None, retry_seconds: float = 600):
+        self.accounts = accounts
+        self.options = options
+        self.metrics = metrics or RunMetrics()
+        self.retry_seconds = retry_seconds
+        self.senders = {
+            account.email: {"sent": 0, "failed": 0, "handed_off": 0, "state": "idle", "reason": None}
+            for account in accounts
+        }
+
+        # macOS 기본값과 같은 spawn 방식 (부모의 스레드/연결 상태를 물려받지 않음)
+        self._context = multiprocessing.get_context("spawn")
+        # 계정별 한 번에 맡기는 행 수 (워커 수의 2배)
+        self._capacity = options["workers"] * 2
+        self._processes = {}  # 계정 → (프로세스, 파이프)
+        self._blocked = {}    # 계정 → 다시 시작할 수 있는 시각
+        self._pending = {}    # 행 번호 → 결과를 아직 받지 못한 행
+        self._backlog = deque()  # 배정을 기다리는 행
+        self._leases = {}     # 계정 → 그 계정에 배정된 행 번호
+        self._started = set()  # 발송을 시작한 행 번호
+        self._tried = {}      # 행 번호 → 계정 오류로 실패한 계정
+        self._closed = set()  # 파이프에 더 쓸 수 없는 계정 (종료 중)
+        self._stopping = False
+        self._on_result = None
+        self._on_drop = None
+        self._on_hold = None
+        self._interrupted = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _start(self):
+        """실행 중이 아니고 다시 시작할 수 있는 계정의 프로세스 시작"""
+        now = time.time()
+        for account in self.accounts:
+            if account.email in self._processes or self._blocked.get(account.email, 0) > now:
+                continue
+            self._blocked.pop(account.email, None)
+            parent_conn, child_conn = self._context.Pipe()
+            process = self._context.Process(
+                target=_run_sender,
+                args=(account, self.options, child_conn),
+                name=f"sender-{account.email}",
+                daemon=True,
+            )
+            process.start()
+            # 자식 쪽 파이프는 자식만 갖도록 닫음 (자식이 종료되면 부모가 EOF로 바로 알 수 있음)
+            child_conn.close()
+            self._processes[account.email] = (process, parent_conn)
+            self._leases[account.email] = set()
+            self.senders[account.email]["state"] = "running"
+            self.metrics.event("sender_start", sender=account.email)
+
+    def seconds_until_available(self) -> float:
+        """발송 가능한 계정이 생길 때까지 남은 시간(초)"""
+        if self._processes or not self._blocked:
+            return 0.0
+        return max(0.0, min(self._blocked.values()) - time.time())
+
+    def run(self, jobs, on_result, on_drop, on_hold) -> bool:
+        """jobs를 계정 프로세스들에 나눠 발송 (모든 행을 처리하면 True, 발송 가능한 계정이 없으면 False)"""
+        self._on_result, self._on_drop, self._on_hold = on_result, on_drop, on_hold
+        jobs = iter(jobs)
+        # 계정별로 맡길 수 있는 만큼만 시트에서 읽어 시트 크기와 관계없이 메모리 사용량 일정
+        window = len(self.accounts) * self._capacity
+        exhausted = False
+        completed = True
+        started = False
+        error = None
+
+        previous_handlers = self._defer_interrupts()
+        try:
+            while True:
+                if self._interrupted:
+                    # 미뤄 둔 종료 신호를 원래 처리기로 처리 (KeyboardInterrupt 발생)
+                    signum, self._interrupted = self._interrupted, None
+                    previous_handlers[signum](signum, None)
+                while not exhausted and len(self._pending) < window:
+                    if not started or not self._processes:
+                        self._start()
+                        started = True
+                        if not self._processes:
+                            break
+                    try:
+                        job = next(jobs, None)
+                    except Exception as e:
+                        # 시트 읽기 오류: 이미 넘긴 행의 결과를 모두 받은 뒤 다시 발생
+                        error, job = e, None
+                    if job is None:
+                        exhausted = True
+                        break
+                    self._pending[job[0]] = job
+                    self._backlog.append(job)
+
+                self._dispatch()
+                if exhausted and not self._pending:
+                    break
+                if not self._processes:
+                    # 발송 가능한 계정이 없음: 남은 행은 다음 실행(또는 계정이 다시 가능해질 때)으로 미룸
+                    self._drain()
+                    completed = False
+                    break
+                self._receive()
+        except KeyboardInterrupt:
+            self._shutdown()
+            raise
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+
+        if error is not None:
+            raise error
+        return completed
+
+    def _defer_interrupts(self) -> dict:
+        """run() 동안 종료 신호를 바로 처리하지 않고 표시만 함 (발송 결과를 반영하는 도중에 끊기지 않도록)
+
+        Python 처리기가 설치된 신호만 미루며, 표시된 신호는 run()의 다음 주기에 원래 처리기로 처리합니다.
+        """
+        self._interrupted = None
+        if threading.current_thread() is not threading.main_thread():
+            return {}
+
+        def interrupt(signum, frame):
+            self._interrupted = self._interrupted or signum
+
+        previous_handlers = {}
+        for signum in INTERRUPT_SIGNALS:
+            handler = signal.getsignal(signum)
+            if callable(handler):
+                previous_handlers[signum] = handler
+                signal.signal(signum, interrupt)
+        return previous_handlers
+
+    def _untried(self, row_idx: int) -> list:
+        """이 행을 아직 시도하지 않은, 실행 중인 계정"""
+        tried = self._tried.get(row_idx, ())
+        return [sender for sender in self._processes if sender not in tried]
+
+    def _dispatch(self):
+        """배정을 기다리는 행을 여유가 있는 계정 중 진행 중인 행이 가장 적은 계정에 배정"""
+        waiting = deque()
+        while self._backlog and self._processes:
+            job = self._backlog.popleft()
+            if job[0] not in self._pending:
+                continue
+            candidates = self._untried(job[0])
+            if not candidates:
+                # 실행 중인 모든 계정이 계정 오류로 실패한 행
+                self._finish(job, False, 0.0, None, "모든 계정에서 발송 실패")
+                continue
+            candidates = [name for name in candidates if name not in self._closed]
+            if not candidates:
+                waiting.append(job)
+                continue
+            sender = min(candidates, key=lambda name: len(self._leases[name]))
+            if len(self._leases[sender]) >= self._capacity:
+                waiting.append(job)
+                continue
+            self._leases[sender].add(job[0])
+            try:
+                self._processes[sender][1].send(job)
+            except OSError:
+                # 이미 종료 중인 프로세스: 배정을 되돌리고 더 배정하지 않음 (남은 메시지와 종료는 _receive에서 처리)
+                self._leases[sender].discard(job[0])
+                self._backlog.appendleft(job)
+                self._closed.add(sender)
+        self._backlog.extendleft(reversed(waiting))
+
+    def _release_lease(self, sender: str, row_idx: int):
+        self._leases.get(sender, set()).discard(row_idx)
+        self._started.discard(row_idx)
+
+    def _finish(self, job, ok: bool, seconds: float, sender: str, reason: str = None):
+        self._pending.pop(job[0], None)
+        self._tried.pop(job[0], None)
+        if sender:
+            self._release_lease(sender, job[0])
+            self.senders[sender]["sent" if ok else "failed"] += 1
+        self._on_result(job, ok, seconds, sender, reason)
+
+    def _drop(self, job):
+        self._pending.pop(job[0], None)
+        self._tried.pop(job[0], None)
+        self._on_drop(job)
+
+    def _hold(self, job, sender: str):
+        self._pending.pop(job[0], None)
+        self._tried.pop(job[0], None)
+        self.senders[sender]["failed"] += 1
+        self._on_hold(job, sender)
+
+    def _receive(self, timeout: float = 1.0):
+        """계정 프로세스들의 메시지 처리 (파이프가 닫힌 프로세스는 비정상 종료로 처리)"""
+        conns = {conn: sender for sender, (_, conn) in self._processes.items()}
+        for conn in multiprocessing.connection.wait(list(conns), timeout):
+            sender = conns[conn]
+            if sender not in self._processes:
+                continue
+            try:
+                kind, payload, seconds, reason = conn.recv()
+            except (EOFError, OSError):
+                process = self._processes[sender][0]
+                process.join(1)
+                self._stopped(sender, {"state": "crashed", "reason": f"exit code {process.exitcode}"})
+                continue
+            self._handle(sender, kind, payload, seconds, reason)
+
+    def _handle(self, sender: str, kind: str, payload, seconds: float, reason: str):
+        if kind == STOPPED:
+            self._stopped(sender, payload)
+            return
+
+        job = payload
+        if job[0] not in self._pending:
+            return
+        if kind == STARTED:
+            self._started.add(job[0])
+        elif kind == SENT:
+            self._finish(job, True, seconds, sender)
+        elif kind == FAILED:
+            self._finish(job, False, seconds, sender, reason)
+        elif kind == RETRY:
+            self._tried.setdefault(job[0], set()).add(sender)
+            if self._stopping or not self._untried(job[0]):
+                self._finish(job, False, seconds, sender, reason)
+            else:
+                self._release_lease(sender, job[0])
+                self.senders[sender]["handed_off"] += 1
+                print(f"[행 {job[0]}] {job[1]} - {sender} 발송 실패 ({reason}), 다른 계정으로 재시도", flush=True)
+                self._backlog.append(job)
+        elif kind == DROPPED:
+            self._release_lease(sender, job[0])
+            if self._stopping:
+                self._drop(job)
+            else:
+                self.senders[sender]["handed_off"] += 1
+                self._backlog.append(job)
+
+    def _stopped(self, sender: str, info: dict):
+        """계정 프로세스 종료 처리 (한도/오류로 물러난 계정은 일정 시간 동안 다시 시작하지 않음)"""
+        self._closed.discard(sender)
+        process, conn = self._processes.pop(sender, (None, None))
+        if process is not None:
+            process.join(5)
+            if process.is_alive():
+                process.kill()
+                process.join()
+            conn.close()
+
+        # 이 계정에 배정된 채 남은 행: 발송을 시작한 행은 보류(발송 여부 불명), 시작 전이면 다른 계정에 다시 배정
+        for row_idx in sorted(self._leases.pop(sender, set())):
+            job = self._pending.get(row_idx)
+            if job is None:
+                continue
+            if row_idx in self._started:
+                self._started.discard(row_idx)
+                self._hold(job, sender)
+            elif self._stopping:
+                self._drop(job)
+            else:
+                self._backlog.append(job)
+
+        state = info["state"]
+        self.senders[sender].update(state=state, reason=info.get("reason"))
+        if info.get("metrics"):
+            self.metrics.merge(info["metrics"])
+        self.metrics.event("sender_stopped", sender=sender, state=state, reason=info.get("reason"))
+
+        if state == "daily_limit":
+            self._blocked[sender] = _next_midnight()
+        elif state != "done":
+            self._blocked[sender] = time.time() + self.retry_seconds
+
+        if state != "done" and not self._stopping:
+            detail = f" - {info['reason']}" if info.get("reason") else ""
+            print(f"\n발신 계정 {sender} 중단: {STATE_LABELS.get(state, state)}{detail}\n", flush=True)
+
+    def _drain(self):
+        """배정되지 못한 행을 on_drop (계정 프로세스가 모두 끝난 뒤 호출)"""
+        self._backlog.clear()
+        for job in list(self._pending.values()):
+            self._drop(job)
+
+    def _shutdown(self):
+        """중단 요청: 진행 중인 발송만 마무리하고 나머지 행은 on_drop"""
+        self._stopping = True
+        for _, conn in self._processes.values():
+            try:
+                conn.send(STOP)
+            except OSError:
+                pass
+        while self._processes:
+            self._receive()
+        self._drain()
+
+    def close(self):
+        """계정 프로세스 종료"""
+        self._stopping = True
+        for _, conn in self._processes.values():
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+        while self._processes:
+            self._receive()
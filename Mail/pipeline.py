@@ -0,0 +1,213 @@
+"""
+동시 발송 파이프라인
+발송할 행을 큐에 넣고 여러 발송 워커가 동시에 처리합니다.
+초당/일일 발송 건수는 공유 RateLimiter로 제한합니다.
+"""
+
+import cProfile
+import json
+import os
+import queue
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+# 워커 종료 신호
+_DONE = object()
+
+
+class RateLimiter:
+    """토큰 버킷 방식의 발송 속도 제한 + 일일 발송 한도
+
+    - 초당 rate_per_second건, 순간 최대 burst건까지 발송
+    - daily_limit > 0이면 하루 발송 건수를 state_path 파일에 저장하여 재실행해도 이어서 계산
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        burst: int = 1,
+        daily_limit: int = 0,
+        state_path: str = None,
+    ):
+        self.rate_per_second = rate_per_second
+        self.burst = max(1, burst)
+        self.daily_limit = daily_limit
+        self.state_path = state_path
+
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._day, self._sent_today = self._load_state()
+
+    def _load_state(self):
+        today = date.today().isoformat()
+        if self.state_path and os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, encoding="utf-8") as f:
+                    state = json.load(f)
+                if state.get("date") == today:
+                    return today, int(state.get("sent", 0))
+            except (OSError, ValueError):
+                pass
+        return today, 0
+
+    def _save_state(self):
+        if not self.state_path:
+            return
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"date": self._day, "sent": self._sent_today}, f)
+        os.replace(tmp_path, self.state_path)
+
+    @property
+    def sent_today(self) -> int:
+        with self._lock:
+            return self._sent_today
+
+    def seconds_until_reset(self) -> float:
+        """일일 발송 건수가 초기화되는 자정까지 남은 시간(초)"""
+        now = datetime.now()
+        tomorrow = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        return (tomorrow - now).total_seconds()
+
+    def _reserve_daily(self) -> bool:
+        """일일 한도 안에서 1건 예약 (한도 초과 시 False)"""
+        today = date.today().isoformat()
+        if today != self._day:
+            self._day, self._sent_today = today, 0
+        if self.daily_limit and self._sent_today >= self.daily_limit:
+            return False
+        self._sent_today += 1
+        self._save_state()
+        return True
+
+    def release(self):
+        """acquire()로 예약했지만 발송하지 않은 1건을 일일 발송 건수에서 되돌림"""
+        with self._lock:
+            if self._sent_today > 0:
+                self._sent_today -= 1
+                self._save_state()
+
+    def acquire(self) -> bool:
+        """발송 1건의 토큰을 얻을 때까지 대기 (일일 한도에 도달하면 False)"""
+        while True:
+            with self._lock:
+                if self.rate_per_second <= 0:
+                    return self._reserve_daily()
+
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate_per_second
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    if not self._reserve_daily():
+                        return False
+                    self._tokens -= 1
+                    return True
+
+                wait = (1 - self._tokens) / self.rate_per_second
+            time.sleep(wait)
+
+
+class Counters:
+    """여러 워커가 함께 쓰는 처리 결과 집계 + 행 단위 콘솔 출력"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.skipped = 0
+        self.duplicate = 0
+        self.suppressed = 0
+        self.failed = 0
+        # 발신 계정별 결과 (여러 계정으로 나눠 발송할 때)
+        self.senders = {}
+
+    def report(self, line: str, result: str = None):
+        """한 행의 처리 결과를 출력하고 해당 카운터 증가 (result: sent/skipped/duplicate/suppressed/failed)"""
+        with self._lock:
+            if result:
+                setattr(self, result, getattr(self, result) + 1)
+            print(line, flush=True)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            counts = {
+                "sent": self.sent,
+                "skipped": self.skipped,
+                "duplicate": self.duplicate,
+                "suppressed": self.suppressed,
+                "failed": self.failed,
+            }
+            if self.senders:
+                counts["senders"] = self.senders
+            return counts
+
+
+def run_pipeline(
+    jobs,
+    handle,
+    workers: int = 1,
+    limiter: RateLimiter = None,
+    queue_size: int = 0,
+    profilers: list = None,
+    on_drop=None,
+) -> bool:
+    """jobs를 bounded 큐에 넣고 workers개의 스레드가 handle(job)으로 처리
+
+    일일 한도에 도달하거나 중단되면 남은 작업은 처리하지 않고(on_drop(job) 호출) False를 반환합니다.
+    profilers에 리스트를 넘기면 워커마다 cProfile 결과를 추가합니다.
+    """
+    jobs_queue = queue.Queue(maxsize=queue_size or workers * 2)
+    stop = threading.Event()
+
+    def worker():
+        if profilers is None:
+            return work()
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            work()
+        finally:
+            profiler.disable()
+            profilers.append(profiler)
+
+    def work():
+        while True:
+            job = jobs_queue.get()
+            if job is _DONE:
+                return
+            if stop.is_set() or (limiter and not limiter.acquire()):
+                stop.set()
+                if on_drop:
+                    on_drop(job)
+                continue
+            try:
+                handle(job)
+            except Exception as e:
+                print(f"작업 처리 중 오류: {e}", flush=True)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, workers))]
+    for thread in threads:
+        thread.start()
+
+    try:
+        for job in jobs:
+            if stop.is_set():
+                if on_drop:
+                    on_drop(job)
+                break
+            jobs_queue.put(job)
+    except BaseException:
+        # Ctrl+C 등으로 중단되면 큐에 남은 작업은 버리고 진행 중인 발송만 마무리
+        stop.set()
+        raise
+    finally:
+        for _ in threads:
+            jobs_queue.put(_DONE)
+        for thread in threads:
+            thread.join()
+
+    return not stop.is_set()
@@ -0,0 +1,104 @@
+"""
+시트 분할 읽기
+시트 전체를 한 번에 내려받지 않고 일정 행 수씩 나눠 읽어 필요한 만큼만 처리합니다.
+첫 미발송 행 위치(재개 커서)를 저장해 두고 다음 실행 때 그 행부터 읽습니다.
+"""
+
+import json
+import os
+import threading
+
+
+def iter_sheet_rows(worksheet, start_row: int = 2, chunk_size: int = 500, last_column: str = "D"):
+    """start_row부터 chunk_size행씩 읽어 (행 번호, 행 값)을 하나씩 반환
+
+    한 번에 chunk_size행만 메모리에 올라가므로 시트 크기와 관계없이 메모리 사용량이 일정합니다.
+    구간 끝부분의 빈 행은 응답에서 빠지므로(뒤에 행이 더 있어도) 빈 응답이 올 때까지 다음 구간을 읽습니다.
+    """
+    row_idx = start_row
+    while True:
+        values = worksheet.get(f"A{row_idx}:{last_column}{row_idx + chunk_size - 1}")
+        if not values:
+            return
+
+        for offset, row in enumerate(values):
+            yield row_idx + offset, row
+        row_idx += chunk_size
+
+
+class ResumeCursor:
+    """첫 미발송 행 번호를 저장하는 재개 커서
+
+    - open(row): 아직 발송이 끝나지 않은 행 (발송 대기/실패)
+    - mark_incomplete(row): 일부만 입력된 행 (완전히 빈 행은 표시하지 않음)
+    - close(row): 발송이 끝난 행
+    저장 시 열린 행 중 가장 앞 행(없으면 마지막으로 읽은 다음 행)을 다음 시작 행으로 기록합니다.
+    시트 주소가 바뀌면 처음(2행)부터 다시 읽으며, 파일을 지우면 전체를 다시 확인합니다.
+    """
+
+    def __init__(self, path: str, sheet_key: str, first_row: int = 2):
+        self.path = path
+        self.sheet_key = sheet_key
+        self.start_row = max(first_row, self._load(first_row))
+
+        self._lock = threading.Lock()
+        self._open = set()
+        self._last_row = self.start_row - 1
+        # 마지막으로 읽은 행들 중 끝부분에 연속된 미완성 행의 시작 (감시 모드에서 다시 확인)
+        self._incomplete_tail = None
+
+    def _load(self, first_row: int) -> int:
+        if not os.path.exists(self.path):
+            return first_row
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return first_row
+        if state.get("sheet") != self.sheet_key:
+            return first_row
+        return int(state.get("next_row", first_row))
+
+    def seen(self, row_idx: int):
+        with self._lock:
+            self._last_row = max(self._last_row, row_idx)
+            self._incomplete_tail = None
+
+    def mark_incomplete(self, row_idx: int):
+        """입력 중이거나 정보가 빠진 행 (seen() 이후 호출)"""
+        with self._lock:
+            self._open.add(row_idx)
+            if self._incomplete_tail is None:
+                self._incomplete_tail = row_idx
+
+    def open(self, row_idx: int):
+        with self._lock:
+            self._open.add(row_idx)
+
+    def close(self, row_idx: int):
+        with self._lock:
+            self._open.discard(row_idx)
+
+    @property
+    def last_row(self) -> int:
+        """지금까지 읽은 마지막 행 번호"""
+        with self._lock:
+            return self._last_row
+
+    @property
+    def scan_row(self) -> int:
+        """감시 모드에서 다음에 확인할 행 (끝부분의 미완성 행은 입력이 끝났을 수 있어 다시 확인)"""
+        with self._lock:
+            return self._incomplete_tail or self._last_row + 1
+
+    @property
+    def next_row(self) -> int:
+        with self._lock:
+            return min(self._open) if self._open else self._last_row + 1
+
+    def save(self):
+        """다음 실행의 시작 행 저장"""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"sheet": self.sheet_key, "next_row": self.next_row}, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,232 @@
+"""
+발송시간 일괄 기록
+발송 결과를 모아두었다가 batch_update 한 번으로 시트에 기록합니다.
+기록 전 프로세스가 종료되어도 로컬 저널에서 복구되므로 발송 표시가 사라지거나
+같은 행이 다시 발송되지 않습니다.
+"""
+
+import json
+import os
+import threading
+import time
+
+
+def column_letter(column: int) -> str:
+    """열 번호(1부터)를 A1 표기법 문자로 변환"""
+    letters = ""
+    while column > 0:
+        column, remainder = divmod(column - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+class SentJournal:
+    """발송 기록을 한 줄씩 추가하는 로컬 저널 (JSON Lines)
+
+    {"sheet": "...", "row": 5, "email": "...", "time": "..."}: 발송 성공, 시트 기록 전
+    시트에 반영된 기록은 저널을 다시 써서 지웁니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load_pending(self) -> dict:
+        """시트에 아직 기록되지 않은 발송 기록 {(시트, 행 번호): 기록} 반환"""
+        pending = {}
+        if not os.path.exists(self.path):
+            return pending
+
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # 기록 도중 종료되어 잘린 마지막 줄
+                    continue
+                pending[(entry["sheet"], entry["row"])] = entry
+        return pending
+
+    def append(self, entries: list):
+        """기록을 추가하고 디스크에 즉시 반영"""
+        with open(self.path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def rewrite(self, entries: list):
+        """남길 기록만으로 저널을 새로 씀 (없으면 저널 삭제)"""
+        if not entries:
+            self.clear()
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """모든 기록이 시트에 반영된 뒤 저널 비우기"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class ResultWriter:
+    """발송시간을 모아서 시트에 일괄 기록하는 버퍼
+
+    flush_rows건이 모이거나 flush_seconds초가 지나면 기록하고, close() 시 남은 기록을 모두 반영합니다.
+    저널 기록은 sheet_key(시트 주소/CSV 경로)별로 구분하며, 이전 실행의 기록은 시트의 이메일이
+    그대로인지 확인한 뒤에만 기록합니다. 다른 시트의 기록은 건드리지 않고 저널에 남겨 둡니다.
+    """
+
+    def __init__(
+        self,
+        worksheet,
+        journal_path: str,
+        sheet_key: str = None,
+        column: int = 4,
+        flush_rows: int = 20,
+        flush_seconds: float = 10,
+    ):
+        self.worksheet = worksheet
+        self.journal = SentJournal(journal_path)
+        self.sheet_key = sheet_key
+        self.column = column
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+
+        self._lock = threading.Lock()
+        # 시트 기록은 한 번에 하나만 (기록하는 동안에도 다른 워커의 record()는 막지 않음)
+        self._flushing = threading.Lock()
+        self._last_flush = time.monotonic()
+        # 기록 실패 후에는 flush_seconds초 동안 재시도하지 않음 (쓰기 할당량 보호)
+        self._retry_at = 0.0
+        # 이전 실행에서 시트에 기록하지 못한 발송 기록 (이 시트 것만, 시트에 기록하기 전 이메일 확인)
+        self._pending = {}
+        self._foreign = []
+        for (sheet, row_idx), entry in self.journal.load_pending().items():
+            if sheet == sheet_key:
+                self._pending[row_idx] = entry
+            else:
+                self._foreign.append(entry)
+        self._unverified = set(self._pending)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def is_recorded(self, row_idx: int) -> bool:
+        """발송되었지만 아직 시트에 기록되지 않은 행인지 확인"""
+        with self._lock:
+            return row_idx in self._pending
+
+    def record(self, row_idx: int, email: str, sent_time: str):
+        """발송 성공 기록 (저널에 먼저 남긴 뒤 버퍼에 추가)"""
+        entry = {"sheet": self.sheet_key, "row": row_idx, "email": email, "time": sent_time}
+        with self._lock:
+            self.journal.append([entry])
+            self._pending[row_idx] = entry
+        self.maybe_flush()
+
+    def maybe_flush(self):
+        """기록 조건(건수 또는 경과 시간)을 만족하면 시트에 반영"""
+        with self._lock:
+            if time.monotonic() < self._retry_at:
+                return
+            due = len(self._pending) >= self.flush_rows or (
+                self._pending and time.monotonic() - self._last_flush >= self.flush_seconds
+            )
+        # 다른 워커가 기록 중이면 기다리지 않고 다음 기회에 반영
+        if due and self._flushing.acquire(blocking=False):
+            try:
+                self._flush()
+            finally:
+                self._flushing.release()
+
+    def _build_ranges(self, entries: list) -> list:
+        """연속된 행은 하나의 범위로 묶어 batch_update 데이터 생성"""
+        letter = column_letter(self.column)
+        data = []
+        start = prev = None
+        values = []
+        for entry in sorted(entries, key=lambda e: e["row"]):
+            row = entry["row"]
+            if prev is not None and row != prev + 1:
+                data.append({"range": f"{letter}{start}:{letter}{prev}", "values": values})
+                start, values = None, []
+            if start is None:
+                start = row
+            values.append([entry["time"]])
+            prev = row
+        if values:
+            data.append({"range": f"{letter}{start}:{letter}{prev}", "values": values})
+        return data
+
+    def _verify_recovered(self):
+        """이전 실행의 기록 중 시트의 이메일이 바뀐 행은 버림 (행 정렬/삭제 등)"""
+        with self._lock:
+            entries = {row_idx: self._pending[row_idx] for row_idx in sorted(self._unverified)}
+        rows = list(entries)
+        values = self.worksheet.get(f"A{rows[0]}:A{rows[-1]}")
+
+        with self._lock:
+            for row_idx, entry in entries.items():
+                offset = row_idx - rows[0]
+                cell = values[offset][0] if offset < len(values) and values[offset] else ""
+                if cell.strip().lower() != entry["email"].strip().lower():
+                    print(f"\n저널의 발송 기록을 건너뜀: [행 {row_idx}] {entry['email']} (현재 시트: {cell or '빈 칸'})")
+                    if self._pending.get(row_idx) is entry:
+                        del self._pending[row_idx]
+            self._unverified.difference_update(entries)
+
+    def flush(self) -> bool:
+        """버퍼에 모인 발송시간을 시트에 기록 (실패 시 버퍼를 유지하고 False 반환)"""
+        with self._flushing:
+            return self._flush()
+
+    def _flush(self) -> bool:
+        """시트 API 호출은 잠금 밖에서 하고, 반영된 기록만 잠금 안에서 버퍼/저널에서 지움 (_flushing 안에서 호출)"""
+        try:
+            if self._unverified:
+                self._verify_recovered()
+        except Exception as e:
+            print(f"\n이전 발송 기록 확인 실패 (다음에 다시 시도): {e}")
+            with self._lock:
+                self._retry_at = time.monotonic() + self.flush_seconds
+            return False
+
+        with self._lock:
+            entries = list(self._pending.values())
+            if not entries:
+                self._last_flush = time.monotonic()
+                return True
+
+        try:
+            self.worksheet.batch_update(
+                self._build_ranges(entries), value_input_option="USER_ENTERED"
+            )
+        except Exception as e:
+            print(f"\n발송시간 기록 실패 ({len(entries)}건, 다음에 다시 시도): {e}")
+            with self._lock:
+                self._retry_at = time.monotonic() + self.flush_seconds
+            return False
+
+        with self._lock:
+            for entry in entries:
+                if self._pending.get(entry["row"]) is entry:
+                    del self._pending[entry["row"]]
+            # 반영된 기록은 저널에서 지움 (감시 모드처럼 오래 실행해도 저널 크기 일정)
+            self.journal.rewrite(self._foreign + list(self._pending.values()))
+            self._last_flush = time.monotonic()
+        return True
+
+    def close(self):
+        """남은 기록을 모두 반영하고, 전부 반영되었으면 저널 정리 (다른 시트의 기록은 남김)"""
+        if self.flush():
+            with self._lock:
+                if not self._pending:
+                    self.journal.rewrite(self._foreign)
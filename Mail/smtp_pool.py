@@ -0,0 +1,172 @@
+"""
+SMTP 연결 풀
+로그인된 SMTP 연결을 여러 개 열어두고 발송 전체에 걸쳐 재사용합니다.
+"""
+
+import queue
+import smtplib
+import threading
+
+from metrics import RunMetrics, failure_reason
+
+# 서버가 연결을 끊겠다는 의미의 응답 코드 (다시 연결 후 재시도)
+RECONNECT_CODES = {421}
+
+
+class PooledConnection:
+    """로그인이 끝난 SMTP 연결과 그 연결로 보낸 메일 수"""
+
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.sent = 0
+
+    def close(self):
+        """연결 종료 (이미 끊긴 연결이어도 오류 없이 정리)"""
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            self.server.close()
+
+
+class SMTPConnectionPool:
+    """로그인된 SMTP 연결을 최대 size개까지 유지하는 스레드 안전 연결 풀
+
+    - 연결은 처음 필요할 때 생성되고, 발송 후 풀에 반납되어 재사용됩니다.
+    - 끊어진 연결(SMTPServerDisconnected, 421 응답)은 다시 연결한 뒤 재시도합니다.
+    - 수신자 거부 등 서버가 메일만 거부한 경우에는 연결을 닫지 않고 풀에 반납합니다.
+    - 한 연결로 max_messages_per_connection건을 보내면 연결을 새로 엽니다.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        size: int = 1,
+        max_messages_per_connection: int = 100,
+        use_ssl: bool = True,
+        timeout: float = 30,
+        max_retries: int = 2,
+        metrics: RunMetrics = None,
+    ):
+        if size < 1:
+            raise ValueError("size는 1 이상이어야 합니다.")
+
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size
+        self.max_messages_per_connection = max_messages_per_connection
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.metrics = metrics or RunMetrics()
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self.stats = {"connects": 0, "reconnects": 0, "recycled": 0, "sent": 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _connect(self) -> PooledConnection:
+        """새 연결을 열고 로그인"""
+        self.metrics.count_call("smtp.connect")
+        with self.metrics.stage("smtp.connect"):
+            if self.use_ssl:
+                server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+            else:
+                server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+
+        self.metrics.count_call("smtp.login")
+        try:
+            with self.metrics.stage("smtp.login"):
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+
+        self._count("connects")
+        return PooledConnection(server)
+
+    @staticmethod
+    def _is_disconnect(error: Exception) -> bool:
+        """다시 연결하면 해결되는 오류인지 확인"""
+        if isinstance(error, (smtplib.SMTPServerDisconnected, ConnectionError)):
+            return True
+        if isinstance(error, smtplib.SMTPResponseException):
+            return error.smtp_code in RECONNECT_CODES
+        return False
+
+    @classmethod
+    def _is_rejection(cls, error: Exception) -> bool:
+        """연결은 정상이고 서버가 이 메일만 거부한 오류인지 확인 (수신자 거부, 4xx/5xx 응답)"""
+        if cls._is_disconnect(error):
+            return False
+        return isinstance(error, (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException))
+
+    def send(self, from_addr: str, to_addr: str, message):
+        """풀의 연결 하나를 빌려 메일 발송 (message: 메일 원문 str 또는 bytes, 실패 시 예외 발생)"""
+        self._slots.acquire()
+        conn = None
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = None
+
+            attempt = 0
+            while True:
+                if conn is None:
+                    conn = self._connect()
+                self.metrics.count_call("smtp.sendmail")
+                try:
+                    with self.metrics.stage("smtp.sendmail"):
+                        conn.server.sendmail(from_addr, to_addr, message)
+                    break
+                except Exception as e:
+                    if self._is_disconnect(e) and attempt < self.max_retries:
+                        conn.close()
+                        conn = None
+                        attempt += 1
+                        self._count("reconnects")
+                        self.metrics.count_retry("smtp.reconnect", failure_reason(e))
+                        continue
+                    if self._is_rejection(e):
+                        # 서버가 이 메일만 거부함 (smtplib가 RSET을 보냈으므로 로그인된 연결은 그대로 재사용)
+                        self._idle.put(conn)
+                    else:
+                        conn.close()
+                    conn = None
+                    raise
+
+            conn.sent += 1
+            self._count("sent")
+
+            # 일정 건수를 보낸 연결은 닫고 다음 발송 때 새로 연결
+            if conn.sent >= self.max_messages_per_connection:
+                conn.close()
+                self._count("recycled")
+            else:
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """풀에 남아있는 모든 연결 종료"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
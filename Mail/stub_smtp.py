@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+로컬 스텁 SMTP 서버
+실제 Gmail 없이 발송 로직을 시험하거나 벤치마크할 때 사용합니다.
+받은 메일은 저장하지 않고 건수만 셉니다. 지연과 실패(일시 오류, 연결 끊김)를 일정 비율로 흉내낼 수 있습니다.
+
+모의 발송(Dry Run) 예시:
+    python3 stub_smtp.py --port 2525
+    SMTP_HOST=127.0.0.1 SMTP_PORT=2525 SMTP_USE_SSL=0 SHEET_BACKEND=csv SHEET_CSV_PATH=test.csv python3 main.py
+"""
+
+import argparse
+import random
+import socketserver
+import threading
+import time
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """연결 하나에 대한 최소한의 SMTP 대화 처리 (EHLO/AUTH/MAIL/RCPT/DATA/RSET/NOOP/QUIT)"""
+
+    def reply(self, line: str):
+        self.wfile.write((line + "\r\n").encode("ascii"))
+
+    def handle(self):
+        server = self.server
+        # TLS 핸드셰이크 + 인사에 걸리는 시간 흉내
+        if server.connect_delay:
+            time.sleep(server.connect_delay)
+        server.count("connections")
+        self.reply("220 stub-smtp ready")
+
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            command = line.split(" ", 1)[0].upper()
+
+            if command in ("EHLO", "HELO"):
+                self.wfile.write(b"250-stub-smtp\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n")
+            elif command == "AUTH":
+                # 로그인 검증 비용 흉내
+                if server.login_delay:
+                    time.sleep(server.login_delay)
+                server.count("logins")
+                self.reply("235 2.7.0 Authentication successful")
+            elif command in ("MAIL", "RCPT", "RSET", "NOOP"):
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while True:
+                    data_line = self.rfile.readline()
+                    if not data_line or data_line == b".\r\n":
+                        break
+                if server.message_delay:
+                    time.sleep(server.message_delay)
+
+                failure = server.pick_failure()
+                if failure == "disconnect":
+                    server.count("disconnects")
+                    self.reply("421 4.7.0 Try again later, closing connection")
+                    return
+                if failure == "temporary":
+                    server.count("failures")
+                    self.reply("451 4.3.0 Temporary server error")
+                    continue
+
+                server.count("messages")
+                self.reply("250 OK queued")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class StubSMTPServer(socketserver.ThreadingTCPServer):
+    """별도 스레드에서 동작하는 스텁 SMTP 서버 (port=0이면 빈 포트 자동 할당)"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        connect_delay: float = 0.0,
+        login_delay: float = 0.0,
+        message_delay: float = 0.0,
+        failure_rate: float = 0.0,
+        disconnect_rate: float = 0.0,
+        seed: int = None,
+    ):
+        super().__init__((host, port), _SMTPHandler)
+        self.connect_delay = connect_delay
+        self.login_delay = login_delay
+        self.message_delay = message_delay
+        self.failure_rate = failure_rate
+        self.disconnect_rate = disconnect_rate
+        self.stats = {"connections": 0, "logins": 0, "messages": 0, "failures": 0, "disconnects": 0}
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def pick_failure(self):
+        """이번 메일에 흉내낼 실패 종류 (None, "temporary", "disconnect")"""
+        with self._lock:
+            value = self._random.random()
+        if value < self.disconnect_rate:
+            return "disconnect"
+        if value < self.disconnect_rate + self.failure_rate:
+            return "temporary"
+        return None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 스텁 SMTP 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2525)
+    parser.add_argument("--connect-delay", type=float, default=0.0, help="연결 지연(초)")
+    parser.add_argument("--login-delay", type=float, default=0.0, help="로그인 지연(초)")
+    parser.add_argument("--message-delay", type=float, default=0.0, help="메일 1건 처리 지연(초)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="451 일시 오류 비율 (0~1)")
+    parser.add_argument("--disconnect-rate", type=float, default=0.0, help="421 응답 후 연결 끊기 비율 (0~1)")
+    args = parser.parse_args()
+
+    server = StubSMTPServer(
+        args.host,
+        args.port,
+        connect_delay=args.connect_delay,
+        login_delay=args.login_delay,
+        message_delay=args.message_delay,
+        failure_rate=args.failure_rate,
+        disconnect_rate=args.disconnect_rate,
+    )
+    print(f"스텁 SMTP 서버 실행 중: {args.host}:{server.port} (Ctrl+C로 종료)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n수신 결과: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
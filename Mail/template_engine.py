@@ -0,0 +1,149 @@
+"""
+사전 컴파일 이메일 템플릿
+템플릿 파일을 시작 시 한 번만 읽어 고정 문자열 조각과 치환 자리({company_name} 등)로 나누고,
+수신자별로는 조각을 이어 붙이기만 합니다.
+고정 조각의 UTF-8 인코딩과 MIME 헤더/파트 헤더도 미리 만들어 두고 재사용합니다.
+"""
+
+import binascii
+import re
+import uuid
+from email.header import Header
+from email.utils import formataddr
+
+# 치환 자리: {영문 소문자/숫자/_} (CSS의 "body {" 같은 중괄호와 구분)
+PLACEHOLDER = re.compile(r"\{([a-z_][a-z0-9_]*)\}")
+
+CRLF = b"\r\n"
+
+
+class CompiledTemplate:
+    """고정 조각과 치환 자리로 미리 나눠둔 템플릿
+
+    chunks[0] + values[slots[0]] + chunks[1] + ... + chunks[-1] 순서로 렌더링합니다.
+    """
+
+    def __init__(self, text: str):
+        self.chunks = []
+        self.slots = []
+        position = 0
+        for match in PLACEHOLDER.finditer(text):
+            self.chunks.append(text[position:match.start()])
+            self.slots.append(match.group(1))
+            position = match.end()
+        self.chunks.append(text[position:])
+
+    @classmethod
+    def from_file(cls, path: str) -> "CompiledTemplate":
+        with open(path, encoding="utf-8") as f:
+            return cls(f.read())
+
+    @property
+    def fields(self) -> set:
+        return set(self.slots)
+
+    def partial(self, **values) -> "CompiledTemplate":
+        """실행 중 바뀌지 않는 값(발신자 정보 등)을 미리 채운 템플릿 반환"""
+        compiled = CompiledTemplate("")
+        compiled.chunks = [self.chunks[0]]
+        for slot, chunk in zip(self.slots, self.chunks[1:]):
+            if slot in values:
+                compiled.chunks[-1] += values[slot] + chunk
+            else:
+                compiled.slots.append(slot)
+                compiled.chunks.append(chunk)
+        return compiled
+
+    def render(self, **values) -> str:
+        """치환 자리에 값을 넣어 완성된 문자열 반환 (값이 없으면 KeyError)"""
+        parts = [self.chunks[0]]
+        for slot, chunk in zip(self.slots, self.chunks[1:]):
+            parts.append(values[slot])
+            parts.append(chunk)
+        return "".join(parts)
+
+    def render_bytes(self, encoded_chunks: list, encoding: str = "utf-8", **values) -> bytes:
+        """미리 인코딩해 둔 고정 조각(encoded_chunks)으로 바로 bytes 생성 (치환 값만 인코딩)"""
+        parts = [encoded_chunks[0]]
+        for slot, chunk in zip(self.slots, encoded_chunks[1:]):
+            parts.append(values[slot].encode(encoding))
+            parts.append(chunk)
+        return b"".join(parts)
+
+
+def _base64_lines(data: bytes) -> bytearray:
+    """본문을 base64로 인코딩하고 76자(원본 57바이트)마다 CRLF로 줄바꿈"""
+    body = bytearray()
+    view = memoryview(data)
+    for i in range(0, len(data), 57):
+        body += binascii.b2a_base64(view[i:i + 57], newline=False)
+        body += CRLF
+    return body
+
+
+def _address_header(address: str) -> bytes:
+    """수신자 주소 헤더 값 (ASCII가 아니면 MIMEMultipart와 같이 RFC 2047로 인코딩)"""
+    try:
+        return address.encode("ascii")
+    except UnicodeEncodeError:
+        return Header(address, "utf-8").encode(linesep="\r\n").encode("ascii")
+
+
+class MessageBuilder:
+    """수신자별 메일 원문(bytes)을 만드는 빌더
+
+    결과는 MIMEMultipart("alternative") + MIMEText(html, "utf-8")로 만든 메일과 같은 구조이며,
+    수신자마다 바뀌지 않는 헤더와 MIME 경계는 미리 인코딩해 둡니다.
+    """
+
+    def __init__(
+        self,
+        html_template: CompiledTemplate,
+        subject_template: CompiledTemplate,
+        sender_name: str,
+        sender_email: str,
+    ):
+        sender = {"sender_name": sender_name, "sender_email": sender_email}
+        self.html_template = html_template.partial(**sender)
+        self.subject_template = subject_template.partial(**sender)
+        self._html_chunks = [chunk.encode("utf-8") for chunk in self.html_template.chunks]
+
+        boundary = f"===============mailer{uuid.uuid4().hex}=="
+        from_header = formataddr((sender_name, sender_email), charset="utf-8")
+        self._message_head = (
+            f'Content-Type: multipart/alternative; boundary="{boundary}"\r\n'
+            "MIME-Version: 1.0\r\n"
+        ).encode("ascii")
+        self._from_line = f"From: {from_header}\r\n".encode("ascii")
+        self._part_head = (
+            f"\r\n--{boundary}\r\n"
+            'Content-Type: text/html; charset="utf-8"\r\n'
+            "MIME-Version: 1.0\r\n"
+            "Content-Transfer-Encoding: base64\r\n"
+            "\r\n"
+        ).encode("ascii")
+        self._message_tail = f"\r\n--{boundary}--\r\n".encode("ascii")
+
+    @classmethod
+    def from_files(cls, html_path: str, subject_path: str, sender_name: str, sender_email: str) -> "MessageBuilder":
+        html_template = CompiledTemplate.from_file(html_path)
+        with open(subject_path, encoding="utf-8") as f:
+            subject_template = CompiledTemplate(f.read().strip())
+        return cls(html_template, subject_template, sender_name, sender_email)
+
+    def render_html(self, **fields) -> str:
+        return self.html_template.render(**fields)
+
+    def build(self, to_email: str, **fields) -> bytes:
+        """수신자 한 명에게 보낼 메일 원문 생성"""
+        subject = self.subject_template.render(**fields)
+        html = self.html_template.render_bytes(self._html_chunks, **fields)
+        return b"".join((
+            self._message_head,
+            b"Subject: ", Header(subject, "utf-8").encode(linesep="\r\n").encode("ascii"), CRLF,
+            self._from_line,
+            b"To: ", _address_header(to_email), CRLF,
+            self._part_head,
+            _base64_lines(html),
+            self._message_tail,
+        ))
@@ -0,0 +1,85 @@
+"""
+가짜 워크시트(메모리/CSV) 테스트
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_sheet import CSVWorksheet, MemoryWorksheet, parse_range, synthetic_rows  # noqa: E402
+
+
+class MemoryWorksheetTest(unittest.TestCase):
+    def test_parse_range(self):
+        self.assertEqual(parse_range("A2:D10"), (2, 1, 10, 4))
+        self.assertEqual(parse_range("AA5"), (5, 27, 5, 27))
+
+    def test_get_trims_trailing_blanks_like_gspread(self):
+        worksheet = MemoryWorksheet([["a", "", ""], ["", ""], ["b", "c"], [], ["", ""]])
+
+        self.assertEqual(worksheet.get("A1:D5"), [["a"], [], ["b", "c"]])
+        self.assertEqual(worksheet.get("A4:D5"), [])
+
+    def test_writes_extend_rows(self):
+        worksheet = MemoryWorksheet(synthetic_rows(1))
+
+        worksheet.batch_update([{"range": "D2:D3", "values": [["t1"], ["t2"]]}])
+        worksheet.update_cell(4, 2, 7)
+
+        self.assertEqual(worksheet.get("A2:D4"), [["user0@example.com", "테스트회사0", "대표0", "t1"], ["", "", "", "t2"], ["", "7"]])
+        self.assertEqual(worksheet.calls["batch_update"], 1)
+
+    def test_synthetic_rows(self):
+        rows = synthetic_rows(6, sent_ratio=0.5, duplicate_every=3)
+
+        self.assertEqual(len(rows), 7)
+        self.assertEqual([bool(row[3]) for row in rows[1:]], [True] * 3 + [False] * 3)
+        self.assertEqual(rows[4][0], rows[3][0])
+
+
+class CSVWorksheetTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "sheet.csv")
+        self.write_file(synthetic_rows(2))
+
+    def write_file(self, rows):
+        with open(self.path, "w", encoding="utf-8", newline="") as f:
+            csv.writer(f).writerows(rows)
+
+    def read_file(self) -> list:
+        with open(self.path, encoding="utf-8", newline="") as f:
+            return list(csv.reader(f))
+
+    def test_writes_are_saved_to_file(self):
+        worksheet = CSVWorksheet(self.path)
+
+        worksheet.batch_update([{"range": "D2:D2", "values": [["sent"]]}])
+
+        self.assertEqual(self.read_file()[1][3], "sent")
+
+    def test_reloads_file_changed_by_another_program(self):
+        worksheet = CSVWorksheet(self.path)
+        worksheet.get("A1:D3")
+
+        # 다른 프로그램에서 행을 추가한 뒤 발송시간을 기록해도 추가된 행이 유지되어야 함
+        rows = self.read_file() + [["new@example.com", "새회사", "새대표", ""]]
+        self.write_file(rows)
+        os.utime(self.path, ns=(0, os.stat(self.path).st_mtime_ns + 1_000_000))
+
+        self.assertEqual(worksheet.get("A4:A4"), [["new@example.com"]])
+        worksheet.update_cell(2, 4, "sent")
+
+        saved = self.read_file()
+        self.assertEqual(len(saved), 4)
+        self.assertEqual(saved[1][3], "sent")
+        self.assertEqual(saved[3][0], "new@example.com")
+
+
+if __name__ == "__main__":
+    unittest.main()
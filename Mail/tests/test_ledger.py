@@ -0,0 +1,100 @@
+"""
+발송 원장 테스트
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+MAIL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, MAIL_DIR)
+
+from ledger import ALREADY_SENT, CLAIMED, DUPLICATE, SUPPRESSED, UNCONFIRMED, SendLedger  # noqa: E402
+
+CAMPAIGN = "campaign"
+
+
+class SendLedgerTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "send_ledger.db")
+
+    def open_ledger(self) -> SendLedger:
+        ledger = SendLedger(self.path, CAMPAIGN)
+        self.addCleanup(ledger.close)
+        return ledger
+
+    def crash_after_claim(self, email: str, row_idx: int):
+        """다른 프로세스에서 발송 의도만 기록하고 원장을 닫지 않은 채 종료"""
+        code = (
+            "import os, sys; sys.path.insert(0, sys.argv[1]); from ledger import SendLedger; "
+            "SendLedger(sys.argv[2], sys.argv[3]).claim(sys.argv[4], int(sys.argv[5])); os._exit(0)"
+        )
+        subprocess.run([sys.executable, "-c", code, MAIL_DIR, self.path, CAMPAIGN, email, str(row_idx)], check=True)
+
+    def test_claim_results(self):
+        ledger = self.open_ledger()
+        ledger.suppress(["blocked@example.com"], "bounce")
+
+        self.assertEqual(ledger.claim("a@example.com", 2), CLAIMED)
+        self.assertEqual(ledger.claim(" A@Example.com ", 3), DUPLICATE)
+        self.assertEqual(ledger.claim("blocked@example.com", 4), SUPPRESSED)
+
+        ledger.confirm("a@example.com")
+        self.assertEqual(self.open_ledger().claim("a@example.com", 5), ALREADY_SENT)
+
+    def test_released_and_unsent_intents_are_removed(self):
+        with SendLedger(self.path, CAMPAIGN) as ledger:
+            ledger.claim("failed@example.com", 2)
+            ledger.release("failed@example.com")
+            ledger.claim("dropped@example.com", 3)
+
+        ledger = self.open_ledger()
+        self.assertEqual(ledger.claim("failed@example.com", 2), CLAIMED)
+        self.assertEqual(ledger.claim("dropped@example.com", 3), CLAIMED)
+
+    def test_crashed_run_intent_is_unconfirmed(self):
+        self.crash_after_claim("a@example.com", 2)
+
+        ledger = self.open_ledger()
+        self.assertEqual(ledger.claim("a@example.com", 2), UNCONFIRMED)
+        self.assertEqual([row[1:3] for row in ledger.unconfirmed()], [("a@example.com", 2)])
+
+        self.assertEqual(ledger.clear_unconfirmed(), 1)
+        self.assertEqual(ledger.claim("a@example.com", 2), CLAIMED)
+
+    def test_live_run_intent_is_not_cleared(self):
+        running = self.open_ledger()
+        running.claim("a@example.com", 2)
+
+        other = self.open_ledger()
+        self.assertEqual(other.unconfirmed(), [])
+        self.assertEqual(other.clear_unconfirmed(), 0)
+
+        running.confirm("a@example.com")
+        self.assertEqual(other.claim("a@example.com", 2), ALREADY_SENT)
+
+    def test_held_intent_survives_close(self):
+        with SendLedger(self.path, CAMPAIGN) as ledger:
+            ledger.claim("a@example.com", 2)
+            ledger.hold("a@example.com")
+
+        ledger = self.open_ledger()
+        self.assertEqual(ledger.claim("a@example.com", 2), UNCONFIRMED)
+        self.assertEqual(ledger.clear_unconfirmed(["a@example.com"]), 1)
+
+    def test_mark_sent_upgrades_unconfirmed_intent(self):
+        self.crash_after_claim("a@example.com", 2)
+
+        ledger = self.open_ledger()
+        ledger.mark_sent("a@example.com", 2)
+
+        self.assertEqual(ledger.unconfirmed(), [])
+        self.assertEqual(ledger.claim("a@example.com", 3), ALREADY_SENT)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,250 @@
+"""
+발송 흐름 테스트 (Google 인증/실제 SMTP 없이 MemoryWorksheet + StubSMTPServer로 실행)
+
+실행: python3 -m pytest tests (또는 python3 -m unittest discover tests)
+"""
+
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from fake_sheet import MemoryWorksheet, synthetic_rows  # noqa: E402
+from ledger import SendLedger  # noqa: E402
+from metrics import RunMetrics  # noqa: E402
+from multi_sender import SenderAccount  # noqa: E402
+from sheet_reader import ResumeCursor  # noqa: E402
+from sheet_writer import SentJournal  # noqa: E402
+from stub_smtp import StubSMTPServer  # noqa: E402
+
+SHEET_KEY = "memory://test"
+HEADER = ["이메일", "회사명", "대표자명", "발송시간"]
+
+
+class MailerTestCase(unittest.TestCase):
+    """임시 상태 폴더와 스텁 SMTP 서버로 main.run()을 실행하는 기반 클래스"""
+
+    message_delay = 0.0
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.state_dir = directory.name
+        self.smtp = StubSMTPServer(message_delay=self.message_delay).__enter__()
+        self.addCleanup(self.smtp.__exit__, None, None, None)
+
+        patcher = mock.patch.multiple(
+            main,
+            SHEET_KEY=SHEET_KEY,
+            CAMPAIGN_ID=SHEET_KEY,
+            STATE_DIR=self.state_dir,
+            HEADER_STYLE_PATH=os.path.join(self.state_dir, "header_style.json"),
+            SENT_JOURNAL_PATH=os.path.join(self.state_dir, "sent_journal.log"),
+            SEND_LEDGER_PATH=os.path.join(self.state_dir, "send_ledger.db"),
+            SHEET_CURSOR_PATH=os.path.join(self.state_dir, "sheet_cursor.json"),
+            SMTP_HOST="127.0.0.1",
+            SMTP_PORT=self.smtp.port,
+            SMTP_USE_SSL=False,
+            SMTP_POOL_SIZE=2,
+            SEND_WORKERS=2,
+            SEND_RATE_PER_SECOND=0,
+            SENDER_ACCOUNTS=[SenderAccount("sender@example.com", "pw", 0)],
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_mailer(self, worksheet, timeout: float = 60):
+        """main.run()을 실행하고 처리 결과 집계 반환 (timeout초 안에 끝나지 않으면 실패)"""
+        result = {}
+        thread = threading.Thread(
+            target=lambda: result.update(counters=main.run(worksheet, RunMetrics())), daemon=True
+        )
+        thread.start()
+        thread.join(timeout)
+        self.assertFalse(thread.is_alive(), "발송이 끝나지 않음")
+        return result["counters"]
+
+    def sent_rows(self, worksheet) -> list:
+        """발송시간이 기록된 행 번호"""
+        return [i for i, row in enumerate(worksheet.rows[1:], start=2) if len(row) > 3 and row[3]]
+
+    def ledger(self) -> SendLedger:
+        ledger = SendLedger(main.SEND_LEDGER_PATH, SHEET_KEY)
+        self.addCleanup(ledger.close)
+        return ledger
+
+
+class SendFlowTest(MailerTestCase):
+    def test_duplicate_email_is_sent_once(self):
+        worksheet = MemoryWorksheet(synthetic_rows(6, duplicate_every=3))
+
+        counters = self.run_mailer(worksheet)
+
+        self.assertEqual(counters.sent, 5)
+        self.assertEqual(counters.duplicate, 1)
+        self.assertEqual(self.smtp.stats["messages"], 5)
+        self.assertNotIn(5, self.sent_rows(worksheet))
+
+    def test_blank_row_does_not_pin_cursor(self):
+        worksheet = MemoryWorksheet([
+            HEADER,
+            ["a@example.com", "회사A", "대표A", ""],
+            ["", "", "", ""],
+            ["b@example.com", "회사B", "대표B", ""],
+        ])
+
+        counters = self.run_mailer(worksheet)
+
+        self.assertEqual(counters.sent, 2)
+        self.assertEqual(self.sent_rows(worksheet), [2, 4])
+        self.assertEqual(ResumeCursor(main.SHEET_CURSOR_PATH, SHEET_KEY).start_row, 5)
+
+    def test_blank_row_at_chunk_boundary_does_not_end_run(self):
+        rows = synthetic_rows(8)
+        rows.insert(4, ["", "", "", ""])
+        worksheet = MemoryWorksheet(rows)
+
+        with mock.patch.object(main, "SHEET_CHUNK_SIZE", 4):
+            counters = self.run_mailer(worksheet)
+
+        self.assertEqual(counters.sent, 8)
+        self.assertEqual(self.sent_rows(worksheet), [2, 3, 4, 6, 7, 8, 9, 10])
+
+    def test_incomplete_row_pins_cursor(self):
+        worksheet = MemoryWorksheet([
+            HEADER,
+            ["a@example.com", "회사A", "", ""],
+            ["b@example.com", "회사B", "대표B", ""],
+        ])
+
+        self.run_mailer(worksheet)
+
+        self.assertEqual(ResumeCursor(main.SHEET_CURSOR_PATH, SHEET_KEY).start_row, 2)
+
+    def test_stale_journal_entry_is_not_applied(self):
+        worksheet = MemoryWorksheet([
+            HEADER,
+            ["new@example.com", "회사A", "대표A", ""],
+            ["kept@example.com", "회사B", "대표B", ""],
+        ])
+        # 이전 실행에서 시트에 기록하지 못한 발송시간 (2행은 그 사이 다른 고객으로 바뀜)
+        SentJournal(main.SENT_JOURNAL_PATH).append([
+            {"sheet": SHEET_KEY, "row": 2, "email": "old@example.com", "time": "2026-01-01 09:00:00"},
+            {"sheet": SHEET_KEY, "row": 3, "email": "kept@example.com", "time": "2026-01-01 09:00:00"},
+        ])
+
+        counters = self.run_mailer(worksheet)
+
+        self.assertEqual(worksheet.rows[2][3], "2026-01-01 09:00:00")
+        self.assertNotEqual(worksheet.rows[1][3], "2026-01-01 09:00:00")
+        self.assertEqual(counters.sent, 1)
+        self.assertEqual(self.smtp.stats["messages"], 1)
+        self.assertFalse(os.path.exists(main.SENT_JOURNAL_PATH))
+
+    def test_cleared_unconfirmed_row_is_sent_next_run(self):
+        worksheet = MemoryWorksheet(synthetic_rows(3))
+        # 이전 실행이 2행 발송 도중 중단되어 발송 의도로 남은 기록
+        with SendLedger(main.SEND_LEDGER_PATH, SHEET_KEY) as ledger:
+            ledger.claim("user0@example.com", 2)
+            ledger.hold("user0@example.com")
+
+        first = self.run_mailer(worksheet)
+        self.assertEqual(first.sent, 2)
+        self.assertEqual(self.sent_rows(worksheet), [3, 4])
+        self.assertEqual(ResumeCursor(main.SHEET_CURSOR_PATH, SHEET_KEY).start_row, 2)
+
+        self.assertEqual(self.ledger().clear_unconfirmed(), 1)
+        second = self.run_mailer(worksheet)
+
+        self.assertEqual(second.sent, 1)
+        self.assertEqual(self.sent_rows(worksheet), [2, 3, 4])
+
+    def test_daily_limit_carries_over_runs(self):
+        account = SenderAccount("sender@example.com", "pw", 3)
+        with mock.patch.object(main, "SENDER_ACCOUNTS", [account]):
+            worksheet = MemoryWorksheet(synthetic_rows(5))
+            first = self.run_mailer(worksheet)
+            second = self.run_mailer(worksheet)
+
+        self.assertEqual(first.sent, 3)
+        self.assertEqual(second.sent, 0)
+        self.assertEqual(self.smtp.stats["messages"], 3)
+        self.assertEqual(self.sent_rows(worksheet), [2, 3, 4])
+        self.assertTrue(os.path.exists(account.quota_path(self.state_dir)))
+        self.assertEqual(self.ledger().unconfirmed(), [])
+
+
+class MultiSenderTest(MailerTestCase):
+    message_delay = 0.05
+
+    def setUp(self):
+        super().setUp()
+        accounts = [SenderAccount("a@example.com", "pw", 0), SenderAccount("b@example.com", "pw", 0)]
+        patcher = mock.patch.object(main, "SENDER_ACCOUNTS", accounts)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_rows_are_split_across_accounts(self):
+        worksheet = MemoryWorksheet(synthetic_rows(20))
+
+        counters = self.run_mailer(worksheet)
+
+        self.assertEqual(counters.sent, 20)
+        self.assertEqual(self.smtp.stats["messages"], 20)
+        self.assertEqual(sum(sender["sent"] for sender in counters.senders.values()), 20)
+
+    def test_retired_account_gives_back_unsent_quota(self):
+        worksheet = MemoryWorksheet(synthetic_rows(20))
+        self.smtp.failure_rate = 1.0
+
+        with mock.patch.object(main, "SENDER_MAX_FAILURES", 2):
+            counters = self.run_mailer(worksheet)
+
+        self.assertEqual(counters.sent, 0)
+        self.assertTrue(all(sender["state"] == "failing" for sender in counters.senders.values()))
+        # 일일 발송 건수는 실제로 SMTP 발송을 시도한 건수만 (물러난 뒤 넘긴 행은 제외)
+        quota = 0
+        for account in main.SENDER_ACCOUNTS:
+            with open(account.quota_path(self.state_dir), encoding="utf-8") as f:
+                quota += json.load(f)["sent"]
+        self.assertEqual(quota, self.smtp.stats["failures"])
+
+    def test_killed_sender_process_does_not_hang(self):
+        worksheet = MemoryWorksheet(synthetic_rows(60))
+        killed = []
+
+        def kill_one_sender():
+            # 발송이 진행되는 도중 계정 프로세스 하나를 강제 종료
+            while self.smtp.stats["messages"] < 5:
+                time.sleep(0.01)
+            children = multiprocessing.active_children()
+            if children:
+                killed.append(children[0].name)
+                os.kill(children[0].pid, signal.SIGKILL)
+
+        threading.Thread(target=kill_one_sender, daemon=True).start()
+        counters = self.run_mailer(worksheet)
+
+        self.assertEqual(len(killed), 1)
+        crashed = [email for email, sender in counters.senders.items() if sender["state"] == "crashed"]
+        self.assertEqual(len(crashed), 1)
+        # 모든 행이 발송 완료 또는 보류(발송 여부 확인 필요)로 끝나고, 보류된 행은 다시 보내지 않도록 원장에 남음
+        held = self.ledger().unconfirmed()
+        self.assertEqual(counters.sent + counters.failed, 60)
+        self.assertEqual(len(held), counters.failed)
+        self.assertEqual(len(self.sent_rows(worksheet)), counters.sent)
+        self.assertLessEqual(self.smtp.stats["messages"], counters.sent + len(held))
+        self.assertEqual(multiprocessing.active_children(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+실행 계측/리포트 파일 테스트
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metrics as metrics_module  # noqa: E402
+from fake_sheet import MemoryWorksheet, synthetic_rows  # noqa: E402
+from metrics import LATENCY_SAMPLE_SIZE, InstrumentedWorksheet, RunMetrics  # noqa: E402
+
+
+def read_events(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class RunMetricsTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.report_dir = directory.name
+
+    def test_summary_counts_stages_and_latency(self):
+        metrics = RunMetrics()
+        with metrics.stage("render"):
+            pass
+        metrics.record_message(2, 0.004, True)
+        metrics.record_message(3, 0.2, False, "SMTPDataError 451")
+        metrics.count_retry("smtp.reconnect", "SMTPServerDisconnected")
+
+        summary = metrics.summary()
+
+        self.assertEqual(summary["stages"]["render"]["count"], 1)
+        self.assertEqual(summary["counts"], {"sent": 1, "failed": 1})
+        self.assertEqual(summary["message_latency_ms"]["count"], 2)
+        self.assertEqual(summary["message_latency_ms"]["histogram"]["<=5ms"], 1)
+        self.assertEqual(summary["message_latency_ms"]["histogram"]["<=250ms"], 1)
+        self.assertEqual(summary["failures"], {"SMTPDataError 451": 1})
+        self.assertEqual(summary["retries"], {"smtp.reconnect": 1})
+
+    def test_latency_sample_is_bounded(self):
+        metrics = RunMetrics()
+        for i in range(LATENCY_SAMPLE_SIZE + 500):
+            metrics.record_message(i, 0.001, True)
+
+        self.assertEqual(len(metrics.latency_sample), LATENCY_SAMPLE_SIZE)
+        self.assertEqual(metrics.summary()["message_latency_ms"]["count"], LATENCY_SAMPLE_SIZE + 500)
+
+    def test_merge_adds_other_process_summary(self):
+        metrics = RunMetrics()
+        other = RunMetrics()
+        with other.stage("render"):
+            pass
+        other.count_call("smtp.login")
+        other.count_failure("send SMTPDataError 451")
+
+        metrics.merge(other.summary())
+        metrics.merge(other.summary())
+
+        summary = metrics.summary()
+        self.assertEqual(summary["stages"]["render"]["count"], 2)
+        self.assertEqual(summary["api_calls"], {"smtp.login": 2})
+        self.assertEqual(summary["failures"], {"send SMTPDataError 451": 2})
+
+    def test_writes_event_log_and_summary(self):
+        metrics = RunMetrics(self.report_dir)
+        metrics.count_retry("smtp.reconnect", "SMTPServerDisconnected")
+        metrics.record_message(2, 0.01, True)
+        metrics.close({"sent": 1})
+
+        events = read_events(metrics.path("events.jsonl"))
+        self.assertEqual([event["event"] for event in events], ["run_start", "retry", "message", "run_end"])
+        self.assertEqual(events[1]["name"], "smtp.reconnect")
+        with open(metrics.path("summary.json"), encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["counts"], {"sent": 1})
+
+    def test_runs_in_same_second_use_separate_files(self):
+        first = RunMetrics(self.report_dir)
+        second = RunMetrics(self.report_dir)
+        first.close()
+        second.close()
+
+        self.assertNotEqual(first.path("summary.json"), second.path("summary.json"))
+        self.assertEqual(len(os.listdir(self.report_dir)), 4)
+
+    def test_events_are_flushed_before_close(self):
+        with mock.patch.object(metrics_module, "EVENTS_FLUSH_SECONDS", 0):
+            metrics = RunMetrics(self.report_dir)
+            metrics.record_message(2, 0.01, True)
+            self.assertEqual(len(read_events(metrics.path("events.jsonl"))), 2)
+        metrics.close()
+
+    def test_instrumented_worksheet_counts_calls(self):
+        metrics = RunMetrics()
+        worksheet = InstrumentedWorksheet(MemoryWorksheet(synthetic_rows(3)), metrics)
+
+        worksheet.get("A2:D4")
+        worksheet.get("A5:D8")
+
+        self.assertEqual(metrics.summary()["api_calls"], {"sheet.get": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
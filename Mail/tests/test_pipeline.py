@@ -0,0 +1,139 @@
+"""
+동시 발송 파이프라인/발송 속도 제한 테스트
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import Counters, RateLimiter, run_pipeline  # noqa: E402
+
+
+class RateLimiterTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.state_path = os.path.join(directory.name, "send_quota.json")
+
+    def test_limits_rate_after_burst(self):
+        limiter = RateLimiter(20, burst=2)
+
+        start = time.monotonic()
+        for _ in range(6):
+            self.assertTrue(limiter.acquire())
+        elapsed = time.monotonic() - start
+
+        # 2건은 바로, 나머지 4건은 초당 20건 속도로 (약 0.2초)
+        self.assertGreaterEqual(elapsed, 0.15)
+        self.assertLess(elapsed, 1.0)
+
+    def test_daily_limit(self):
+        limiter = RateLimiter(0, daily_limit=3)
+
+        results = [limiter.acquire() for _ in range(5)]
+
+        self.assertEqual(results, [True, True, True, False, False])
+        self.assertEqual(limiter.sent_today, 3)
+
+    def test_daily_count_carries_over_runs(self):
+        RateLimiter(0, daily_limit=3, state_path=self.state_path).acquire()
+        RateLimiter(0, daily_limit=3, state_path=self.state_path).acquire()
+
+        limiter = RateLimiter(0, daily_limit=3, state_path=self.state_path)
+        self.assertEqual(limiter.sent_today, 2)
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire())
+
+    def test_daily_count_resets_on_new_day(self):
+        with open(self.state_path, "w", encoding="utf-8") as f:
+            json.dump({"date": "2000-01-01", "sent": 500}, f)
+
+        limiter = RateLimiter(0, daily_limit=3, state_path=self.state_path)
+
+        self.assertEqual(limiter.sent_today, 0)
+        self.assertTrue(limiter.acquire())
+        with open(self.state_path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"date": date.today().isoformat(), "sent": 1})
+
+    def test_release_gives_back_reserved_slot(self):
+        limiter = RateLimiter(0, daily_limit=2, state_path=self.state_path)
+        limiter.acquire()
+        limiter.acquire()
+
+        limiter.release()
+
+        self.assertEqual(RateLimiter(0, state_path=self.state_path).sent_today, 1)
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire())
+
+    def test_seconds_until_reset(self):
+        self.assertTrue(0 < RateLimiter(0).seconds_until_reset() <= 24 * 3600)
+
+
+class RunPipelineTest(unittest.TestCase):
+    def test_handles_every_job_concurrently(self):
+        handled = []
+        lock = threading.Lock()
+        active = []
+
+        def handle(job):
+            with lock:
+                active.append(job)
+            time.sleep(0.05)
+            with lock:
+                handled.append(job)
+
+        start = time.monotonic()
+        self.assertTrue(run_pipeline(range(8), handle, workers=4))
+
+        self.assertEqual(sorted(handled), list(range(8)))
+        self.assertLess(time.monotonic() - start, 0.35)
+
+    def test_daily_limit_drops_remaining_jobs(self):
+        handled, dropped = [], []
+
+        completed = run_pipeline(
+            range(10),
+            handled.append,
+            workers=1,
+            limiter=RateLimiter(0, daily_limit=4),
+            on_drop=dropped.append,
+        )
+
+        self.assertFalse(completed)
+        self.assertEqual(handled, [0, 1, 2, 3])
+        self.assertTrue(dropped)
+        self.assertEqual(set(handled) & set(dropped), set())
+        self.assertLessEqual(len(handled) + len(dropped), 10)
+
+    def test_handler_error_does_not_stop_workers(self):
+        handled = []
+
+        def handle(job):
+            if job == 1:
+                raise ValueError("bad row")
+            handled.append(job)
+
+        self.assertTrue(run_pipeline(range(4), handle, workers=1))
+        self.assertEqual(handled, [0, 2, 3])
+
+
+class CountersTest(unittest.TestCase):
+    def test_counts_results(self):
+        counters = Counters()
+        counters.report("sent", "sent")
+        counters.report("failed", "failed")
+        counters.report("note")
+
+        self.assertEqual(counters.as_dict(), {"sent": 1, "skipped": 0, "duplicate": 0, "suppressed": 0, "failed": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
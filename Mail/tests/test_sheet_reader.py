@@ -0,0 +1,82 @@
+"""
+시트 분할 읽기/재개 커서 테스트
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_sheet import MemoryWorksheet  # noqa: E402
+from sheet_reader import ResumeCursor, iter_sheet_rows  # noqa: E402
+
+HEADER = ["이메일", "회사명", "대표자명", "발송시간"]
+
+
+def customer(i: int) -> list:
+    return [f"user{i}@example.com", f"회사{i}", f"대표{i}", ""]
+
+
+class IterSheetRowsTest(unittest.TestCase):
+    def test_reads_all_chunks(self):
+        worksheet = MemoryWorksheet([HEADER] + [customer(i) for i in range(9)])
+
+        rows = list(iter_sheet_rows(worksheet, chunk_size=4))
+
+        self.assertEqual([row_idx for row_idx, _ in rows], list(range(2, 11)))
+        self.assertEqual(rows[0][1][:3], customer(0)[:3])
+
+    def test_blank_row_at_chunk_boundary_does_not_end_reading(self):
+        # 2~5행 구간의 마지막 행(5행)이 빈 행이면 응답이 3행만 오지만 뒤의 행도 읽어야 함
+        rows = [HEADER] + [customer(i) for i in range(3)] + [["", "", "", ""]] + [customer(i) for i in range(3, 8)]
+        worksheet = MemoryWorksheet(rows)
+
+        row_indexes = [row_idx for row_idx, row in iter_sheet_rows(worksheet, chunk_size=4) if any(row)]
+
+        self.assertEqual(row_indexes, [2, 3, 4, 6, 7, 8, 9, 10])
+
+    def test_starts_from_given_row(self):
+        worksheet = MemoryWorksheet([HEADER] + [customer(i) for i in range(5)])
+
+        row_indexes = [row_idx for row_idx, _ in iter_sheet_rows(worksheet, start_row=4, chunk_size=2)]
+
+        self.assertEqual(row_indexes, [4, 5, 6])
+
+
+class ResumeCursorTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "sheet_cursor.json")
+
+    def test_saves_first_open_row(self):
+        cursor = ResumeCursor(self.path, "sheet")
+        for row_idx in range(2, 6):
+            cursor.seen(row_idx)
+            cursor.open(row_idx)
+        for row_idx in (2, 3, 5):
+            cursor.close(row_idx)
+        cursor.save()
+
+        self.assertEqual(ResumeCursor(self.path, "sheet").start_row, 4)
+
+    def test_saves_next_row_when_all_closed(self):
+        cursor = ResumeCursor(self.path, "sheet")
+        for row_idx in range(2, 5):
+            cursor.seen(row_idx)
+        cursor.save()
+
+        self.assertEqual(ResumeCursor(self.path, "sheet").start_row, 5)
+
+    def test_other_sheet_starts_from_first_row(self):
+        cursor = ResumeCursor(self.path, "sheet")
+        cursor.seen(10)
+        cursor.save()
+
+        self.assertEqual(ResumeCursor(self.path, "other").start_row, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+발송시간 일괄 기록/저널 복구 테스트
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_sheet import MemoryWorksheet, synthetic_rows  # noqa: E402
+from sheet_writer import ResultWriter, SentJournal  # noqa: E402
+
+SHEET_KEY = "memory://test"
+SENT_TIME = "2026-01-01 09:00:00"
+
+
+class BlockingWorksheet(MemoryWorksheet):
+    """batch_update가 release될 때까지 멈추는 워크시트 (시트 API 왕복 지연 흉내)"""
+
+    def __init__(self, rows):
+        super().__init__(rows)
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def batch_update(self, data, **kwargs):
+        self.entered.set()
+        self.release.wait(10)
+        super().batch_update(data, **kwargs)
+
+
+class FailingWorksheet(MemoryWorksheet):
+    def batch_update(self, data, **kwargs):
+        raise OSError("quota exceeded")
+
+
+class ResultWriterTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.journal_path = os.path.join(directory.name, "sent_journal.log")
+
+    def open_writer(self, worksheet, **kwargs) -> ResultWriter:
+        return ResultWriter(worksheet, self.journal_path, sheet_key=SHEET_KEY, **kwargs)
+
+    def journal_rows(self) -> list:
+        if not os.path.exists(self.journal_path):
+            return []
+        with open(self.journal_path, encoding="utf-8") as f:
+            return [json.loads(line)["row"] for line in f]
+
+    def test_batches_contiguous_rows(self):
+        worksheet = MemoryWorksheet(synthetic_rows(6))
+        writer = self.open_writer(worksheet, flush_rows=4)
+
+        for row_idx in (2, 3, 4, 6):
+            writer.record(row_idx, f"user{row_idx - 2}@example.com", SENT_TIME)
+
+        self.assertEqual(worksheet.calls["batch_update"], 1)
+        self.assertEqual([row[3] if len(row) > 3 else "" for row in worksheet.rows[1:]], [SENT_TIME] * 3 + ["", SENT_TIME, ""])
+        self.assertEqual(self.journal_rows(), [])
+
+    def test_recovers_journal_after_crash(self):
+        worksheet = MemoryWorksheet(synthetic_rows(3))
+        crashed = self.open_writer(worksheet, flush_rows=100)
+        crashed.record(2, "user0@example.com", SENT_TIME)
+        crashed.record(3, "user1@example.com", SENT_TIME)
+
+        writer = self.open_writer(worksheet)
+        self.assertTrue(writer.is_recorded(2))
+        writer.close()
+
+        self.assertEqual(worksheet.rows[1][3], SENT_TIME)
+        self.assertEqual(worksheet.rows[2][3], SENT_TIME)
+        self.assertFalse(os.path.exists(self.journal_path))
+
+    def test_skips_recovered_entry_when_email_changed(self):
+        worksheet = MemoryWorksheet(synthetic_rows(2))
+        SentJournal(self.journal_path).append([
+            {"sheet": SHEET_KEY, "row": 2, "email": "moved@example.com", "time": SENT_TIME},
+            {"sheet": SHEET_KEY, "row": 3, "email": "USER1@example.com", "time": SENT_TIME},
+        ])
+
+        self.open_writer(worksheet).close()
+
+        self.assertEqual(worksheet.rows[1][3], "")
+        self.assertEqual(worksheet.rows[2][3], SENT_TIME)
+
+    def test_keeps_other_sheet_entries(self):
+        worksheet = MemoryWorksheet(synthetic_rows(2))
+        other = {"sheet": "memory://other", "row": 2, "email": "user0@example.com", "time": SENT_TIME}
+        SentJournal(self.journal_path).append([other])
+
+        writer = self.open_writer(worksheet)
+        writer.record(2, "user0@example.com", SENT_TIME)
+        writer.close()
+
+        self.assertEqual(worksheet.rows[1][3], SENT_TIME)
+        self.assertEqual(list(SentJournal(self.journal_path).load_pending().values()), [other])
+
+    def test_failed_write_keeps_buffer_and_journal(self):
+        worksheet = FailingWorksheet(synthetic_rows(2))
+        writer = self.open_writer(worksheet, flush_rows=1)
+
+        writer.record(2, "user0@example.com", SENT_TIME)
+
+        self.assertFalse(writer.flush())
+        self.assertTrue(writer.is_recorded(2))
+        self.assertEqual(self.journal_rows(), [2])
+
+    def test_record_is_not_blocked_by_sheet_write(self):
+        worksheet = BlockingWorksheet(synthetic_rows(3))
+        writer = self.open_writer(worksheet, flush_rows=1)
+        flusher = threading.Thread(target=writer.record, args=(2, "user0@example.com", SENT_TIME))
+        flusher.start()
+        self.assertTrue(worksheet.entered.wait(10))
+
+        # 첫 기록을 시트에 쓰는 동안 다른 워커의 기록은 바로 끝나야 함
+        recorder = threading.Thread(target=writer.record, args=(3, "user1@example.com", SENT_TIME))
+        recorder.start()
+        recorder.join(2)
+        finished = not recorder.is_alive()
+        worksheet.release.set()
+        flusher.join(10)
+        recorder.join(10)
+        writer.close()
+
+        self.assertTrue(finished)
+        self.assertEqual(worksheet.rows[1][3], SENT_TIME)
+        self.assertEqual(worksheet.rows[2][3], SENT_TIME)
+        self.assertFalse(os.path.exists(self.journal_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
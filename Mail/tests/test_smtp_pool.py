@@ -0,0 +1,88 @@
+"""
+SMTP 연결 풀 테스트 (스텁 SMTP 서버 사용)
+"""
+
+import os
+import smtplib
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smtp_pool import SMTPConnectionPool  # noqa: E402
+from stub_smtp import StubSMTPServer  # noqa: E402
+
+MESSAGE = "Subject: test\r\n\r\nhello\r\n"
+
+
+class SMTPConnectionPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.smtp = StubSMTPServer().__enter__()
+        self.addCleanup(self.smtp.__exit__, None, None, None)
+
+    def open_pool(self, **kwargs) -> SMTPConnectionPool:
+        pool = SMTPConnectionPool("127.0.0.1", self.smtp.port, "sender@example.com", "pw", use_ssl=False, **kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def fail_next(self, *failures):
+        """다음 메일들에 흉내낼 실패 종류 지정 (이후에는 정상 발송)"""
+        failures = list(failures)
+        self.smtp.pick_failure = lambda: failures.pop(0) if failures else None
+
+    def send(self, pool, count: int = 1):
+        for i in range(count):
+            pool.send("sender@example.com", f"user{i}@example.com", MESSAGE)
+
+    def test_reuses_logged_in_connection(self):
+        pool = self.open_pool()
+
+        self.send(pool, 5)
+
+        self.assertEqual(self.smtp.stats["messages"], 5)
+        self.assertEqual(self.smtp.stats["logins"], 1)
+        self.assertEqual(pool.stats["sent"], 5)
+
+    def test_recycles_connection_after_max_messages(self):
+        pool = self.open_pool(max_messages_per_connection=3)
+
+        self.send(pool, 7)
+
+        self.assertEqual(self.smtp.stats["connections"], 3)
+        self.assertEqual(pool.stats["recycled"], 2)
+
+    def test_reconnects_after_disconnect(self):
+        pool = self.open_pool()
+        self.fail_next("disconnect")
+
+        self.send(pool)
+
+        self.assertEqual(self.smtp.stats["messages"], 1)
+        self.assertEqual(self.smtp.stats["connections"], 2)
+        self.assertEqual(pool.stats["reconnects"], 1)
+
+    def test_gives_up_after_max_retries(self):
+        pool = self.open_pool(max_retries=1)
+        self.fail_next("disconnect", "disconnect")
+
+        with self.assertRaises(smtplib.SMTPResponseException):
+            self.send(pool)
+
+        self.send(pool)
+        self.assertEqual(self.smtp.stats["messages"], 1)
+
+    def test_rejected_message_keeps_connection(self):
+        pool = self.open_pool()
+        self.fail_next("temporary")
+
+        with self.assertRaises(smtplib.SMTPDataError):
+            self.send(pool)
+        self.send(pool, 3)
+
+        self.assertEqual(self.smtp.stats["messages"], 3)
+        self.assertEqual(self.smtp.stats["connections"], 1)
+        self.assertEqual(pool.stats["reconnects"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
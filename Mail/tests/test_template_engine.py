@@ -0,0 +1,109 @@
+"""
+사전 컴파일 템플릿/메일 원문 테스트 (기존 MIMEMultipart 방식과 같은 메일인지 비교)
+"""
+
+import email
+import os
+import sys
+import unittest
+from email.header import decode_header, make_header
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.utils import formataddr
+
+MAIL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, MAIL_DIR)
+
+from template_engine import CompiledTemplate, MessageBuilder  # noqa: E402
+
+TEMPLATE_DIR = os.path.join(MAIL_DIR, "templates")
+SENDER_NAME = "홍길동"
+SENDER_EMAIL = "sender@gmail.com"
+
+
+def header(message, name: str) -> str:
+    return str(make_header(decode_header(message[name])))
+
+
+class CompiledTemplateTest(unittest.TestCase):
+    def test_render_keeps_css_braces(self):
+        template = CompiledTemplate("body { color: red; } <p>{company_name} {representative_name}님</p>")
+
+        self.assertEqual(template.fields, {"company_name", "representative_name"})
+        self.assertEqual(
+            template.render(company_name="회사", representative_name="대표"),
+            "body { color: red; } <p>회사 대표님</p>",
+        )
+
+    def test_partial_fills_fixed_values(self):
+        template = CompiledTemplate("{sender_name} -> {company_name}").partial(sender_name="홍길동")
+
+        self.assertEqual(template.fields, {"company_name"})
+        self.assertEqual(template.render(company_name="회사"), "홍길동 -> 회사")
+
+    def test_missing_value_raises(self):
+        with self.assertRaises(KeyError):
+            CompiledTemplate("{company_name}").render()
+
+    def test_render_bytes_matches_render(self):
+        template = CompiledTemplate("<p>{company_name}</p>")
+        encoded = [chunk.encode("utf-8") for chunk in template.chunks]
+
+        self.assertEqual(template.render_bytes(encoded, company_name="회사"), "<p>회사</p>".encode("utf-8"))
+
+
+class MessageBuilderTest(unittest.TestCase):
+    def setUp(self):
+        self.builder = MessageBuilder.from_files(
+            os.path.join(TEMPLATE_DIR, "cold_email.html"),
+            os.path.join(TEMPLATE_DIR, "cold_email_subject.txt"),
+            SENDER_NAME,
+            SENDER_EMAIL,
+        )
+
+    def legacy_message(self, to_email: str, **fields):
+        """기존 방식 (MIMEMultipart + MIMEText)으로 만든 같은 메일"""
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = self.builder.subject_template.render(**fields)
+        msg["From"] = formataddr((SENDER_NAME, SENDER_EMAIL))
+        msg["To"] = to_email
+        msg.attach(MIMEText(self.builder.render_html(**fields), "html", "utf-8"))
+        return email.message_from_string(msg.as_string())
+
+    def assert_same_message(self, to_email: str, **fields):
+        raw = self.builder.build(to_email, **fields)
+        built = email.message_from_bytes(raw)
+        legacy = self.legacy_message(to_email, **fields)
+
+        for name in ("Subject", "From", "To", "MIME-Version"):
+            self.assertEqual(header(built, name), header(legacy, name), name)
+        self.assertEqual(built["To"], legacy["To"])
+        self.assertEqual(built.get_content_type(), "multipart/alternative")
+        built_parts, legacy_parts = built.get_payload(), legacy.get_payload()
+        self.assertEqual(len(built_parts), len(legacy_parts))
+        self.assertEqual(built_parts[0].get_content_type(), legacy_parts[0].get_content_type())
+        self.assertEqual(built_parts[0].get_content_charset(), legacy_parts[0].get_content_charset())
+        self.assertEqual(built_parts[0].get_payload(decode=True), legacy_parts[0].get_payload(decode=True))
+        # 메일 원문의 한 줄은 998자를 넘지 않아야 함 (RFC 5322)
+        self.assertTrue(all(len(line) <= 998 for line in raw.split(b"\r\n")))
+
+    def test_matches_legacy_message(self):
+        self.assert_same_message("user@example.com", company_name="테스트회사", representative_name="김대표")
+
+    def test_matches_legacy_message_with_long_subject(self):
+        self.assert_same_message("user@example.com", company_name="아주 긴 회사 이름" * 10, representative_name="대표")
+
+    def test_non_ascii_recipient_is_header_encoded(self):
+        self.assert_same_message("홍길동@예시.kr", company_name="회사", representative_name="대표")
+
+    def test_fields_are_rendered(self):
+        built = email.message_from_bytes(self.builder.build("user@example.com", company_name="ACME", representative_name="김대표"))
+        html = built.get_payload()[0].get_payload(decode=True).decode("utf-8")
+
+        self.assertIn("ACME", header(built, "Subject"))
+        self.assertIn("김대표", html)
+        self.assertIn(SENDER_EMAIL, html)
+
+
+if __name__ == "__main__":
+    unittest.main()
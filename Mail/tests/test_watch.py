@@ -0,0 +1,165 @@
+"""
+감시 모드 테스트
+"""
+
+import csv
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+MAIL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, MAIL_DIR)
+
+import main  # noqa: E402
+from fake_sheet import MemoryWorksheet, synthetic_rows  # noqa: E402
+from metrics import RunMetrics  # noqa: E402
+from multi_sender import SenderAccount  # noqa: E402
+from test_mailer import MailerTestCase  # noqa: E402
+
+
+def fake_time(*sleep_effects):
+    """main.time 대역: sleep()이 불릴 때마다 sleep_effects를 차례로 실행 (마지막에는 종료 요청)"""
+    effects = list(sleep_effects)
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        if not effects:
+            raise KeyboardInterrupt
+        effects.pop(0)()
+
+    clock = mock.Mock(wraps=time)
+    clock.sleep.side_effect = sleep
+    return clock, sleeps
+
+
+class WatchModeTest(MailerTestCase):
+    def run_watch(self, worksheet, *sleep_effects) -> tuple:
+        clock, sleeps = fake_time(*sleep_effects)
+        with mock.patch.object(main, "time", clock):
+            counters = main.run(worksheet, RunMetrics(), watch=True)
+        return counters, sleeps
+
+    def test_sends_rows_added_while_watching(self):
+        worksheet = MemoryWorksheet(synthetic_rows(3))
+
+        def add_rows():
+            worksheet.rows.append(["late1@example.com", "회사4", "대표4"])
+            worksheet.rows.append(["late2@example.com", "회사5", "대표5", ""])
+
+        with mock.patch.object(main, "WATCH_INTERVAL", 30):
+            counters, sleeps = self.run_watch(worksheet, add_rows, lambda: None)
+
+        self.assertEqual(counters.sent, 5)
+        self.assertEqual(self.sent_rows(worksheet), [2, 3, 4, 5, 6])
+        self.assertEqual(sleeps, [30, 30, 30])
+        self.assertLessEqual(self.smtp.stats["logins"], main.SMTP_POOL_SIZE)
+
+    def test_finishes_row_being_typed(self):
+        worksheet = MemoryWorksheet(synthetic_rows(1))
+        worksheet.rows.append(["typing@example.com", "회사", ""])
+
+        def finish_typing():
+            worksheet.rows[2][2] = "대표"
+
+        counters, _ = self.run_watch(worksheet, finish_typing)
+
+        self.assertEqual(counters.sent, 2)
+        self.assertEqual(self.sent_rows(worksheet), [2, 3])
+
+    def test_waits_for_daily_limit_reset(self):
+        worksheet = MemoryWorksheet(synthetic_rows(4))
+
+        with mock.patch.object(main, "SENDER_ACCOUNTS", [SenderAccount("sender@example.com", "pw", 2)]):
+            counters, sleeps = self.run_watch(worksheet)
+
+        self.assertEqual(counters.sent, 2)
+        self.assertEqual(len(sleeps), 1)
+        self.assertGreater(sleeps[0], 0)
+        self.assertLessEqual(sleeps[0], 24 * 3600)
+
+    def test_sheet_error_is_retried_next_cycle(self):
+        calls = []
+
+        def send_from(start_row):
+            calls.append(start_row)
+            if len(calls) == 1:
+                raise OSError("sheet unavailable")
+            raise KeyboardInterrupt
+
+        cursor = mock.Mock(scan_row=7, next_row=3)
+        clock, _ = fake_time(lambda: None, lambda: None)
+        with mock.patch.object(main, "time", clock):
+            with self.assertRaises(KeyboardInterrupt):
+                main.watch_new_rows(send_from, cursor, mock.Mock(), RunMetrics(), lambda: 0, True)
+
+        self.assertEqual(calls, [7, 7])
+
+
+@unittest.skipUnless(hasattr(signal, "SIGHUP"), "SIGHUP 없음")
+class HangupTest(unittest.TestCase):
+    """실행 창을 닫았을 때(SIGHUP) 진행 중인 작업을 마무리하고 종료하는지 확인 (별도 프로세스로 실행)"""
+
+    SCRIPT = (
+        "import os, sys; sys.path.insert(0, sys.argv[1]); from stub_smtp import StubSMTPServer; "
+        "smtp = StubSMTPServer(message_delay=0.01).__enter__(); os.environ['SMTP_PORT'] = str(smtp.port); "
+        "import main; main.main(watch=True)"
+    )
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.state_dir = directory.name
+        self.sheet_path = os.path.join(self.state_dir, "sheet.csv")
+        with open(self.sheet_path, "w", encoding="utf-8", newline="") as f:
+            csv.writer(f).writerows(synthetic_rows(20))
+
+    def run_until_hangup(self, sender_accounts: str = "") -> int:
+        env = dict(
+            os.environ,
+            SHEET_BACKEND="csv",
+            SHEET_CSV_PATH=self.sheet_path,
+            MAILER_STATE_DIR=self.state_dir,
+            GMAIL_ID="sender@example.com",
+            GMAIL_APP_PASSWORD="pw",
+            SENDER_ACCOUNTS=sender_accounts,
+            SMTP_HOST="127.0.0.1",
+            SMTP_USE_SSL="0",
+            SEND_RATE_PER_SECOND="0",
+            WATCH_INTERVAL="0.1",
+        )
+        with open(os.path.join(self.state_dir, "output.log"), "w", encoding="utf-8") as log:
+            process = subprocess.Popen(
+                [sys.executable, "-c", self.SCRIPT, MAIL_DIR], env=env, stdout=log, stderr=subprocess.STDOUT
+            )
+        # 첫 발송이 끝나고 감시 주기가 돌기 시작하면 재개 위치 파일이 생김
+        cursor_path = os.path.join(self.state_dir, "sheet_cursor.json")
+        deadline = time.monotonic() + 60
+        while not os.path.exists(cursor_path) and time.monotonic() < deadline and process.poll() is None:
+            time.sleep(0.05)
+        process.send_signal(signal.SIGHUP)
+        return process.wait(60)
+
+    def assert_finished(self):
+        with open(self.sheet_path, encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertTrue(all(len(row) > 3 and row[3] for row in rows[1:]))
+        reports = os.listdir(os.path.join(self.state_dir, "reports"))
+        self.assertEqual(len([name for name in reports if name.endswith(".summary.json")]), 1)
+
+    def test_hangup_single_account(self):
+        self.assertEqual(self.run_until_hangup(), 0)
+        self.assert_finished()
+
+    def test_hangup_multiple_accounts(self):
+        self.assertEqual(self.run_until_hangup("a@example.com:pw,b@example.com:pw"), 0)
+        self.assert_finished()
+
+
+if __name__ == "__main__":
+    unittest.main()